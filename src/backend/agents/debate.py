@@ -1,10 +1,10 @@
 """Debate Floor Agent System - Multi-agent debate for market analysis."""
 
-from typing import Annotated, List, TypedDict, Dict, Any, Optional
+from typing import Annotated, List, TypedDict, Dict, Any, Optional, Tuple
 import datetime
 import os
 import math
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -460,14 +460,36 @@ def calculate_time_decay_metrics(end_date_str: str, current_price: float) -> Dic
 
 
 # --- State Definition ---
+
+# Transcript order of agent messages. Independent agents run in parallel and
+# finish in any order, so the reducer re-sorts the transcript by this rank.
+MESSAGE_ORDER = [
+    "Statistics Expert",
+    "Time Decay Analyst",
+    "Top Traders Analyst",
+    "Generalist Expert",
+    "Crypto/Macro Analyst",
+    "Devil's Advocate",
+    "Moderator",
+]
+_MESSAGE_RANK = {name: rank for rank, name in enumerate(MESSAGE_ORDER)}
+
+
+def add_ordered_messages(left: List[BaseMessage], right: List[BaseMessage]) -> List[BaseMessage]:
+    """Merge messages like add_messages, then stable-sort them into transcript order."""
+    merged = add_messages(left, right)
+    return sorted(merged, key=lambda m: _MESSAGE_RANK.get(m.name, len(_MESSAGE_RANK)))
+
+
 class DebateState(TypedDict):
-    messages: Annotated[List[BaseMessage], add_messages]
+    messages: Annotated[List[BaseMessage], add_ordered_messages]
     market_data: Dict[str, Any]
     market_question: str
     verdict: str
     price_history_24h: Optional[List[float]]  # Price history for calculations
     price_history_7d: Optional[List[float]]   # 7-day price history
     top_traders: Optional[List[Dict[str, Any]]]
+    named_messages: List[Tuple[str, str]]  # (agent name, content) pairs, set by transcript
 
 # --- Agents ---
 
@@ -970,6 +992,16 @@ def moderator(state: DebateState):
             "verdict": "Verdict generation failed."
         }
 
+def transcript(state: DebateState):
+    """Flattens the named agent messages into (name, content) pairs for the API."""
+    return {
+        "named_messages": [
+            (m.name, m.content if isinstance(m.content, str) else str(m.content))
+            for m in state["messages"]
+            if isinstance(m, HumanMessage) and m.name
+        ]
+    }
+
 # --- Graph Construction ---
 
 # Agent definitions for dynamic graph building
@@ -993,10 +1025,19 @@ AGENT_ORDER = [
     "devils_advocate",
 ]
 
+# Agents that read earlier arguments from the transcript; every other agent only
+# reads market inputs and can run in parallel.
+DEPENDENT_AGENTS = {"devils_advocate"}
+
 
 def build_debate_graph(config: Optional[AgentConfig] = None) -> StateGraph:
     """
     Build a debate graph with only the enabled agents.
+
+    Independent agents fan out from the start node and run concurrently; the
+    Devil's Advocate (if enabled) joins on all of them, then the Moderator
+    delivers the verdict and a final transcript step flattens the named
+    messages into (name, content) pairs for the API.
     
     Args:
         config: Agent configuration specifying which agents to enable.
@@ -1022,23 +1063,24 @@ def build_debate_graph(config: Optional[AgentConfig] = None) -> StateGraph:
     
     # Moderator is always added (required for verdict)
     workflow.add_node("moderator", moderator)
+    workflow.add_node("transcript", transcript)
     
-    # Build the chain
-    if enabled_agents:
-        # Set entry point to first enabled agent
-        workflow.set_entry_point(enabled_agents[0])
-        
-        # Chain agents together
-        for i in range(len(enabled_agents) - 1):
-            workflow.add_edge(enabled_agents[i], enabled_agents[i + 1])
-        
-        # Last agent connects to moderator
-        workflow.add_edge(enabled_agents[-1], "moderator")
+    parallel_agents = [a for a in enabled_agents if a not in DEPENDENT_AGENTS]
+    join_node = "devils_advocate" if "devils_advocate" in enabled_agents else "moderator"
+
+    if parallel_agents:
+        # Fan out from the start, fan in once every parallel agent has finished
+        for agent_name in parallel_agents:
+            workflow.add_edge(START, agent_name)
+        workflow.add_edge(parallel_agents, join_node)
     else:
-        # No agents enabled, go straight to moderator
-        workflow.set_entry_point("moderator")
+        workflow.set_entry_point(join_node)
+
+    if join_node != "moderator":
+        workflow.add_edge(join_node, "moderator")
     
-    workflow.add_edge("moderator", END)
+    workflow.add_edge("moderator", "transcript")
+    workflow.add_edge("transcript", END)
     
     return workflow.compile()
 
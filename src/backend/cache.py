@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 """
-In-memory TTL cache for Polymarket user stats.
+In-memory TTL caches shared across routes.
 
 Caches global PnL, ROI, and balance data per wallet address to avoid
 repeated external API calls to Polymarket's data-api. Shared across
-the /trades and /holders endpoints.
+the /trades and /holders endpoints. A generic TTLCache backs short-lived
+snapshots such as the market fields read by the debate floor, and the
+cached_response decorator reuses whole endpoint responses for a few seconds.
+A slug-to-ID map of the active markets lets slug lookups hit the primary key.
 """
 
+import functools
 import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -71,5 +78,105 @@ class UserStatsCache:
         return len(self._cache)
 
 
-# Singleton shared across endpoints
+class TTLCache:
+    """Bounded in-memory TTL cache with least-recently-used eviction.
+
+    Args:
+        ttl_seconds: Time-to-live for cache entries in seconds.
+        maxsize: Maximum number of entries kept before evicting the oldest.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024) -> None:
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._ttl = ttl_seconds
+        self._maxsize = maxsize
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value if present and not expired, else None."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if (time.monotonic() - entry[0]) >= self._ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value with the current timestamp, evicting the LRU entry if full."""
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any | None:
+        """Remove and return a cached value, if any."""
+        entry = self._cache.pop(key, None)
+        return entry[1] if entry else None
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key satisfies `predicate`."""
+        for key in [key for key in self._cache if predicate(key)]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._cache.clear()
+
+    @property
+    def size(self) -> int:
+        """Return the number of entries currently in the cache."""
+        return len(self._cache)
+
+
+def cached_response(
+    cache: TTLCache,
+    key: Callable[..., Hashable],
+    should_cache: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Cache an async endpoint's return value in `cache`.
+
+    FastAPI calls endpoints with keyword arguments only, so `key` receives the
+    same keyword arguments and returns the cache key. `should_cache` can reject
+    results (e.g. empty fallbacks after an upstream error) from being stored.
+    The wrapper keeps the endpoint's signature, so dependencies still resolve.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            cache_key = key(**kwargs)
+            hit = cache.get(cache_key)
+            if hit is not None:
+                return hit
+            result = await func(**kwargs)
+            if should_cache is None or should_cache(result):
+                cache.set(cache_key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Singletons shared across endpoints
 user_stats_cache = UserStatsCache(ttl_seconds=300)
+
+# Market fields read by the debate floor, keyed by the requested ID or slug
+market_snapshot_cache = TTLCache(ttl_seconds=60, maxsize=1024)
+
+# Whole-response caches for the read-mostly market endpoints
+top_markets_cache = TTLCache(ttl_seconds=30, maxsize=1)
+price_history_cache = TTLCache(ttl_seconds=60, maxsize=1024)
+market_stats_cache = TTLCache(ttl_seconds=60, maxsize=1024)
+market_trades_cache = TTLCache(ttl_seconds=15, maxsize=256)
+market_holders_cache = TTLCache(ttl_seconds=300, maxsize=256)
+
+# Stored news per market, keyed by the requested ID or slug and the page limit
+market_news_cache = TTLCache(ttl_seconds=60, maxsize=1024)
+
+# Resolved user profiles, keyed by the username or wallet that was looked up
+user_profile_cache = TTLCache(ttl_seconds=300, maxsize=1024)
+
+# Slug -> ID for the active markets, rebuilt whenever the market table is refreshed
+market_slug_ids: dict[str, str] = {}
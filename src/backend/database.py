@@ -18,10 +18,24 @@ class Base(DeclarativeBase):
     pass
 
 
+def _engine_options(url: str) -> dict:
+    """Build pool options for the engine; in-memory SQLite uses a static pool."""
+    options: dict = {"pool_pre_ping": True}
+    if ":memory:" not in url:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
+    **_engine_options(settings.DATABASE_URL),
 )
 
 async_session_factory = async_sessionmaker(
@@ -49,10 +63,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def _create_schema(conn) -> None:
+    Base.metadata.create_all(conn)
+    # create_all skips existing tables along with their indexes, so indexes
+    # added to a model later are created on their own
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db() -> None:
-    """Initialize the database by creating all tables."""
+    """Initialize the database by creating all tables and indexes."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_schema)
 
 
 async def close_db() -> None:
@@ -0,0 +1,64 @@
+"""
+Shared HTTP clients for Polymarket's public APIs.
+
+Route handlers reuse these pooled clients so repeated calls to the CLOB,
+data-api and gamma hosts keep their connections alive instead of paying a fresh
+TCP/TLS handshake on every request. The CLOB and data-api clients speak
+HTTP/2 so concurrent calls (e.g. the 24h and 7d histories behind /stats, or
+prefetched position pages) are multiplexed over a single connection.
+Clients are closed on app shutdown.
+"""
+
+import httpx
+
+CLOB_API_URL = "https://clob.polymarket.com"
+DATA_API_URL = "https://data-api.polymarket.com"
+GAMMA_API_URL = "https://gamma-api.polymarket.com"
+
+
+class SharedHTTPClient:
+    """Lazily created, process-wide HTTP client for a single API host."""
+
+    def __init__(self, base_url: str, timeout: float, http2: bool = False) -> None:
+        """
+        Initialize the shared client.
+
+        Args:
+            base_url: Host that relative request paths are resolved against.
+            timeout: Default request timeout in seconds.
+            http2: Negotiate HTTP/2 (requires the `h2` package).
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.http2 = http2
+        self._client: httpx.AsyncClient | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instances
+clob_http = SharedHTTPClient(CLOB_API_URL, timeout=10.0, http2=True)
+data_api_http = SharedHTTPClient(DATA_API_URL, timeout=15.0, http2=True)
+gamma_http = SharedHTTPClient(GAMMA_API_URL, timeout=10.0)
+
+
+async def close_http_clients() -> None:
+    """Close every shared HTTP client."""
+    await clob_http.close()
+    await data_api_http.close()
+    await gamma_http.close()
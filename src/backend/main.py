@@ -17,14 +17,20 @@ def new_getaddrinfo(*args, **kwargs):
 socket.getaddrinfo = new_getaddrinfo
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.backend.config import settings
 from src.backend.database import close_db, init_db
+from src.backend.http_clients import close_http_clients
 from src.backend.polymarket.client import polymarket_client
 from src.backend.news.aggregator import news_aggregator
 from src.backend.routes import markets, news, debate, users
-from src.backend.tasks.update_markets import get_scheduler, update_top_markets
+from src.backend.tasks.update_markets import (
+    get_scheduler,
+    refresh_market_slug_ids,
+    update_top_markets,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -53,6 +59,11 @@ async def lifespan(app: FastAPI):
         logger.info("Initial market data loaded")
     except Exception as e:
         logger.error(f"Failed to load initial market data: {e}")
+        # Still index the markets already stored so slug lookups stay fast
+        try:
+            await refresh_market_slug_ids()
+        except Exception as e:
+            logger.error(f"Failed to index market slugs: {e}")
 
     # Start background scheduler
     scheduler = get_scheduler()
@@ -66,6 +77,7 @@ async def lifespan(app: FastAPI):
     scheduler.shutdown()
     await polymarket_client.close()
     await news_aggregator.close()
+    await close_http_clients()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -76,6 +88,7 @@ app = FastAPI(
     description="API for tracking top Polymarket markets with real-time news",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -72,6 +72,7 @@ class PriceHistory(Base):
 
     __table_args__ = (
         Index("idx_price_history_market_time", "market_id", "timestamp"),
+        Index("idx_price_history_timestamp", "timestamp"),
     )
 
     def to_dict(self) -> dict:
@@ -3,26 +3,64 @@
 import json
 import logging
 import asyncio
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import bindparam, or_, select
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import httpx
 
-from src.backend.database import get_db
+from src.backend.cache import TTLCache, market_slug_ids, market_snapshot_cache
+from src.backend.database import async_session_factory
+from src.backend.http_clients import data_api_http
 from src.backend.models import Market
-from src.backend.agents.debate import build_debate_graph, DebateState, AgentConfig
-from src.backend.routes.markets import fetch_price_history_from_clob
+from src.backend.agents.debate import (
+    AGENT_NODES,
+    AGENT_ORDER,
+    DEFAULT_AGENT_CONFIG,
+    AgentConfig,
+    DebateState,
+    build_debate_graph,
+)
+from src.backend.routes.markets import CONDITION_ID_RE, fetch_price_history_from_clob
 from src.backend.polymarket.client import polymarket_client
-from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.messages import BaseMessage
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/debate", tags=["debate"])
 
+# Per-request memo for artifacts that are immutable within one debate (market row,
+# top traders). initiate_debate installs a fresh dict on entry.
+_REQUEST_CACHE: ContextVar[dict | None] = ContextVar("debate_req_cache", default=None)
+
+_DEFAULT_AGENT_CONFIG = MappingProxyType(DEFAULT_AGENT_CONFIG)
+
+# In-flight debate runs and recently finished results, keyed by
+# (market ID, enabled agents), so identical requests share one graph run.
+_inflight: dict[tuple, asyncio.Task] = {}
+_debate_results = TTLCache(ttl_seconds=120, maxsize=256)
+
+# Background debate jobs by job ID. Running tasks are also held in a set so they
+# aren't garbage collected if their job entry expires first.
+_debate_jobs = TTLCache(ttl_seconds=900, maxsize=512)
+_background_tasks: set[asyncio.Task] = set()
+
+# Per-message content cap for debate responses; `?full=true` opts out
+MAX_CONTENT = 4096
+
+
+@lru_cache(maxsize=2 ** len(AGENT_NODES))
+def _compiled_graph(enabled_agents: frozenset[str]):
+    """Compile (once) the debate graph for a given set of enabled agents."""
+    return build_debate_graph({name: name in enabled_agents for name in AGENT_NODES})
+
 
 class AgentConfigRequest(BaseModel):
     """Request model for agent configuration."""
@@ -50,6 +88,12 @@ class DebateResponse(BaseModel):
     enabled_agents: List[str]
 
 
+class DebateJob(BaseModel):
+    """Response model for a submitted background debate."""
+    job_id: str
+    status: str
+
+
 def _parse_float(value: object) -> float:
     try:
         return float(value)
@@ -57,8 +101,34 @@ def _parse_float(value: object) -> float:
         return 0.0
 
 
+_TRADE_VALUE_KEYS = ("value", "tradeValue", "totalValue", "total_value", "usdValue", "usd_value", "notional")
+
+_PNL_KEYS = (
+    "totalPnl",
+    "total_pnl",
+    "profitLoss",
+    "profit_loss",
+    "pnl",
+    "profit",
+    "cashPnl",
+)
+
+_VALUE_KEYS = (
+    "currentValue",
+    "current_value",
+    "value",
+    "positionValue",
+    "position_value",
+    "markValue",
+    "mark_value",
+    "notionalValue",
+    "notional_value",
+    "totalValue",
+    "total_value",
+)
+
 def _parse_trade_value(trade: dict, size: float, price: float) -> float:
-    for key in ("value", "tradeValue", "totalValue", "total_value", "usdValue", "usd_value", "notional"):
+    for key in _TRADE_VALUE_KEYS:
         raw = trade.get(key)
         if raw is None:
             continue
@@ -70,15 +140,7 @@ def _parse_trade_value(trade: dict, size: float, price: float) -> float:
 
 
 def _extract_position_pnl(position: dict) -> float:
-    for key in (
-        "totalPnl",
-        "total_pnl",
-        "profitLoss",
-        "profit_loss",
-        "pnl",
-        "profit",
-        "cashPnl",
-    ):
+    for key in _PNL_KEYS:
         raw = position.get(key)
         if raw is None:
             continue
@@ -93,19 +155,7 @@ def _extract_position_pnl(position: dict) -> float:
 
 
 def _extract_position_value(position: dict) -> float:
-    for key in (
-        "currentValue",
-        "current_value",
-        "value",
-        "positionValue",
-        "position_value",
-        "markValue",
-        "mark_value",
-        "notionalValue",
-        "notional_value",
-        "totalValue",
-        "total_value",
-    ):
+    for key in _VALUE_KEYS:
         raw = position.get(key)
         if raw is None:
             continue
@@ -123,24 +173,29 @@ def _compute_global_stats(positions: list[dict], closed_positions: list[dict] |
     total_cost_basis = 0.0
     total_balance = 0.0
 
+    # Local binds keep the per-record loop off the global lookup path
+    _pnl = _extract_position_pnl
+    _val = _extract_position_value
+    _pf = _parse_float
+
     for position in positions:
         if not isinstance(position, dict):
             continue
-        global_pnl += _extract_position_pnl(position)
+        global_pnl += _pnl(position)
 
-        initial_val = _parse_float(position.get("initialValue") or 0)
+        initial_val = _pf(position.get("initialValue") or 0)
         if initial_val > 0:
             total_cost_basis += initial_val
 
-        total_balance += _extract_position_value(position)
+        total_balance += _val(position)
 
     if closed_positions:
         for position in closed_positions:
             if not isinstance(position, dict):
                 continue
-            global_pnl += _extract_position_pnl(position)
+            global_pnl += _pnl(position)
 
-            total_bought = _parse_float(position.get("totalBought") or 0)
+            total_bought = _pf(position.get("totalBought") or 0)
             if total_bought > 0:
                 total_cost_basis += total_bought
 
@@ -151,7 +206,123 @@ def _compute_global_stats(positions: list[dict], closed_positions: list[dict] |
     return global_pnl, global_roi, total_balance
 
 
-async def _fetch_top_traders(market: Market, days: int = 7, limit: int = 500, top_n: int = 5) -> list[dict]:
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.1
+_RETRY_MAX_DELAY = 1.0
+_RETRY_AFTER_MAX = 5.0
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    raw = response.headers.get("Retry-After")
+    if raw is None:
+        return None
+    try:
+        return min(_RETRY_AFTER_MAX, max(0.0, float(raw)))
+    except ValueError:
+        return None
+
+
+async def _get_with_retry(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    GET with exponential backoff on connect/read timeouts and transient statuses.
+
+    A 429 with a Retry-After header waits for the advertised delay (capped) instead
+    of the backoff schedule. The last response or exception is surfaced to the caller.
+    """
+    delay = _RETRY_BASE_DELAY
+    for attempt in range(1, _RETRY_ATTEMPTS + 1):
+        try:
+            response = await client.get(url, **kwargs)
+        except (httpx.ConnectError, httpx.ReadTimeout):
+            if attempt == _RETRY_ATTEMPTS:
+                raise
+            wait = delay
+        else:
+            if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_ATTEMPTS:
+                return response
+            retry_after = _retry_after_seconds(response)
+            wait = retry_after if retry_after is not None else delay
+        await asyncio.sleep(wait)
+        delay = min(_RETRY_MAX_DELAY, delay * 2)
+    raise RuntimeError("unreachable")
+
+
+# Only the columns the debate reads; selecting them directly skips ORM hydration
+_MARKET_COLUMNS = (
+    Market.id,
+    Market.slug,
+    Market.title,
+    Market.yes_percentage,
+    Market.volume_24h,
+    Market.volume_7d,
+    Market.liquidity,
+    Market.end_date,
+    Market.clob_token_ids,
+)
+
+# Built once at import. A primary-key lookup for condition IDs and known slugs,
+# and a combined one (an exact ID match wins over a slug match) for the rest.
+_MARKET_BY_ID = select(*_MARKET_COLUMNS).where(Market.id == bindparam("k")).limit(1)
+_MARKET_LOOKUP = (
+    select(*_MARKET_COLUMNS)
+    .where(or_(Market.id == bindparam("k"), Market.slug == bindparam("k")))
+    .order_by((Market.id == bindparam("k")).desc())
+    .limit(1)
+)
+
+
+async def _get_market_snapshot(market_id: str) -> dict | None:
+    """
+    Look up the debate's market fields by ID or slug.
+
+    Served from the per-request memo, then the shared TTL snapshot cache. Only a
+    miss on both opens a database session, which is closed again before
+    returning so it never spans the long-running agent calls.
+    """
+    cache = _REQUEST_CACHE.get()
+    key = ("market", market_id)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    snapshot = market_snapshot_cache.get(market_id)
+    if snapshot is None:
+        # Exactly one query: slugs of active markets resolve to a primary-key
+        # lookup, anything else not shaped like a condition ID to the combined one
+        known_id = market_slug_ids.get(market_id)
+        if known_id is not None:
+            stmt, params = _MARKET_BY_ID, {"k": known_id}
+        elif CONDITION_ID_RE.match(market_id):
+            stmt, params = _MARKET_BY_ID, {"k": market_id}
+        else:
+            stmt, params = _MARKET_LOOKUP, {"k": market_id}
+        async with async_session_factory() as db:
+            row = (await db.execute(stmt, params)).first()
+        if row is not None:
+            snapshot = dict(row._mapping)
+            # Serialized once per cache fill rather than on every debate
+            snapshot["end_date_str"] = str(snapshot["end_date"])
+            market_snapshot_cache.set(market_id, snapshot)
+
+    if cache is not None and snapshot is not None:
+        cache[key] = snapshot
+    return snapshot
+
+
+async def _fetch_top_traders(market: dict, days: int = 7, limit: int = 500, top_n: int = 5) -> list[dict]:
+    """Fetch top actors for the Debate Floor, memoized for the current request."""
+    cache = _REQUEST_CACHE.get()
+    key = ("top_traders", market["id"], days, limit, top_n)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    top_traders = await _load_top_traders(market, days=days, limit=limit, top_n=top_n)
+    if cache is not None:
+        cache[key] = top_traders
+    return top_traders
+
+
+async def _load_top_traders(market: dict, days: int = 7, limit: int = 500, top_n: int = 5) -> list[dict]:
     """
     Fetch top actors for the Debate Floor.
 
@@ -161,109 +332,112 @@ async def _fetch_top_traders(market: Market, days: int = 7, limit: int = 500, to
     """
     # 1) Try top holders first (these are guaranteed to be positioned on this market)
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                "https://data-api.polymarket.com/holders",
-                params={"market": market.id},
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list) and data:
-                    holders: list[dict] = []
-                    for token_data in data:
-                        if not isinstance(token_data, dict):
+        client = data_api_http.get()
+        response = await _get_with_retry(
+            client,
+            "/holders",
+            params={"market": market["id"]},
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list) and data:
+                holders: list[dict] = []
+                for token_data in data:
+                    if not isinstance(token_data, dict):
+                        continue
+                    token_holders = token_data.get("holders", [])
+                    if not isinstance(token_holders, list):
+                        continue
+                    for holder in token_holders:
+                        if not isinstance(holder, dict):
                             continue
-                        token_holders = token_data.get("holders", [])
-                        if not isinstance(token_holders, list):
+                        address = holder.get("proxyWallet")
+                        if not address:
                             continue
-                        for holder in token_holders:
-                            if not isinstance(holder, dict):
-                                continue
-                            address = holder.get("proxyWallet")
-                            if not address:
-                                continue
-                            holders.append(
-                                {
-                                    "address": address,
-                                    "name": holder.get("name") or holder.get("pseudonym"),
-                                    "profile_image": holder.get("profileImage"),
-                                    "position_amount": _parse_float(holder.get("amount") or 0),
-                                    "outcome_index": holder.get("outcomeIndex"),
-                                    "source": "holders",
-                                }
-                            )
-
-                    if holders:
-                        holders.sort(key=lambda x: x.get("position_amount", 0), reverse=True)
-                        top_holders = holders[: max(1, top_n)]
-
-                        # Enrich with global stats + portfolio value
-                        async with httpx.AsyncClient(timeout=15.0) as client2:
-                            semaphore = asyncio.Semaphore(8)
-
-                            async def enrich(address: str):
-                                async with semaphore:
-                                    positions = []
-                                    closed_positions = []
-                                    value_total = 0.0
-
-                                    try:
-                                        r = await client2.get(
-                                            "https://data-api.polymarket.com/positions",
-                                            params={"user": address, "limit": "500"},
-                                        )
-                                        if r.status_code == 200:
-                                            positions = r.json()
-                                    except Exception:
-                                        positions = []
-
-                                    try:
-                                        r = await client2.get(
-                                            "https://data-api.polymarket.com/closed-positions",
-                                            params={"user": address, "limit": "500"},
-                                        )
-                                        if r.status_code == 200:
-                                            closed_positions = r.json()
-                                    except Exception:
-                                        closed_positions = []
-
-                                    try:
-                                        r = await client2.get(
-                                            "https://data-api.polymarket.com/value",
-                                            params={"user": address},
-                                        )
-                                        if r.status_code == 200:
-                                            payload = r.json()
-                                            if isinstance(payload, list) and payload:
-                                                value_total = _parse_float(payload[0].get("value") or 0)
-                                    except Exception:
-                                        value_total = 0.0
-
-                                positions = positions if isinstance(positions, list) else []
-                                closed_positions = closed_positions if isinstance(closed_positions, list) else []
-                                global_pnl, global_roi, total_balance = _compute_global_stats(positions, closed_positions)
-                                if value_total > 0:
-                                    total_balance = value_total
-                                return address, global_pnl, global_roi, total_balance
-
-                            stats_results = await asyncio.gather(*[enrich(h["address"]) for h in top_holders])
-                            stats_map = {addr: (pnl, roi, bal) for addr, pnl, roi, bal in stats_results}
-
-                        for holder in top_holders:
-                            pnl, roi, bal = stats_map.get(holder["address"], (0.0, 0.0, 0.0))
-                            holder["global_pnl"] = pnl
-                            holder["global_roi"] = roi
-                            holder["total_balance"] = bal
-
-                        return top_holders
+                        holders.append(
+                            {
+                                "address": address,
+                                "name": holder.get("name") or holder.get("pseudonym"),
+                                "profile_image": holder.get("profileImage"),
+                                "position_amount": _parse_float(holder.get("amount") or 0),
+                                "outcome_index": holder.get("outcomeIndex"),
+                                "source": "holders",
+                            }
+                        )
+
+                if holders:
+                    holders.sort(key=lambda x: x.get("position_amount", 0), reverse=True)
+                    top_holders = holders[: max(1, top_n)]
+
+                    # Enrich with global stats + portfolio value
+                    semaphore = asyncio.Semaphore(8)
+
+                    async def enrich(address: str):
+                        async with semaphore:
+                            positions = []
+                            closed_positions = []
+                            value_total = 0.0
+
+                            try:
+                                r = await _get_with_retry(
+                                    client,
+                                    "/positions",
+                                    params={"user": address, "limit": "500"},
+                                )
+                                if r.status_code == 200:
+                                    positions = r.json()
+                            except Exception:
+                                positions = []
+
+                            try:
+                                r = await _get_with_retry(
+                                    client,
+                                    "/closed-positions",
+                                    params={"user": address, "limit": "500"},
+                                )
+                                if r.status_code == 200:
+                                    closed_positions = r.json()
+                            except Exception:
+                                closed_positions = []
+
+                            try:
+                                r = await _get_with_retry(
+                                    client,
+                                    "/value",
+                                    params={"user": address},
+                                )
+                                if r.status_code == 200:
+                                    payload = r.json()
+                                    if isinstance(payload, list) and payload:
+                                        value_total = _parse_float(payload[0].get("value") or 0)
+                            except Exception:
+                                value_total = 0.0
+
+                        positions = positions if isinstance(positions, list) else []
+                        closed_positions = closed_positions if isinstance(closed_positions, list) else []
+                        global_pnl, global_roi, total_balance = _compute_global_stats(positions, closed_positions)
+                        if value_total > 0:
+                            total_balance = value_total
+                        return address, global_pnl, global_roi, total_balance
+
+                    stats_results = await asyncio.gather(*[enrich(h["address"]) for h in top_holders])
+                    stats_map = {addr: (pnl, roi, bal) for addr, pnl, roi, bal in stats_results}
+
+                    for holder in top_holders:
+                        pnl, roi, bal = stats_map.get(holder["address"], (0.0, 0.0, 0.0))
+                        holder["global_pnl"] = pnl
+                        holder["global_roi"] = roi
+                        holder["total_balance"] = bal
+
+                    return top_holders
     except Exception as e:
         logger.debug(f"Top holders fetch failed (falling back to trades): {e}")
 
     identifiers = []
-    if market.slug:
-        identifiers.append(market.slug)
-    if market.id and market.id not in identifiers:
-        identifiers.append(market.id)
+    if market["slug"]:
+        identifiers.append(market["slug"])
+    if market["id"] and market["id"] not in identifiers:
+        identifiers.append(market["id"])
 
     trades: list[dict] = []
     for identifier in identifiers:
@@ -277,8 +451,8 @@ async def _fetch_top_traders(market: Market, days: int = 7, limit: int = 500, to
 
     cutoff = datetime.utcnow() - timedelta(days=days)
     market_keys = {
-        str(market.slug).strip().lower() if market.slug else None,
-        str(market.id).strip().lower() if market.id else None,
+        str(market["slug"]).strip().lower() if market["slug"] else None,
+        str(market["id"]).strip().lower() if market["id"] else None,
     }
     market_keys.discard(None)
 
@@ -381,56 +555,59 @@ async def _fetch_top_traders(market: Market, days: int = 7, limit: int = 500, to
     traders.sort(key=lambda x: x.get("total_volume", 0), reverse=True)
     top_traders = traders[:top_n]
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        semaphore = asyncio.Semaphore(8)
+    client = data_api_http.get()
+    semaphore = asyncio.Semaphore(8)
+
+    async def fetch_user_stats(address: str):
+        async with semaphore:
+            positions = []
+            closed_positions = []
+            value_total = 0.0
 
-        async def fetch_user_stats(address: str):
-            async with semaphore:
+            try:
+                response = await _get_with_retry(
+                    client,
+                    "/positions",
+                    params={"user": address, "limit": "500"},
+                )
+                if response.status_code == 200:
+                    positions = response.json()
+            except Exception:
                 positions = []
+
+            try:
+                response = await _get_with_retry(
+                    client,
+                    "/closed-positions",
+                    params={"user": address, "limit": "500"},
+                )
+                if response.status_code == 200:
+                    closed_positions = response.json()
+            except Exception:
                 closed_positions = []
+
+            try:
+                response = await _get_with_retry(
+                    client,
+                    "/value",
+                    params={"user": address},
+                )
+                if response.status_code == 200:
+                    payload = response.json()
+                    if isinstance(payload, list) and payload:
+                        value_total = _parse_float(payload[0].get("value") or 0)
+            except Exception:
                 value_total = 0.0
 
-                try:
-                    response = await client.get(
-                        "https://data-api.polymarket.com/positions",
-                        params={"user": address, "limit": "500"},
-                    )
-                    if response.status_code == 200:
-                        positions = response.json()
-                except Exception:
-                    positions = []
-
-                try:
-                    response = await client.get(
-                        "https://data-api.polymarket.com/closed-positions",
-                        params={"user": address, "limit": "500"},
-                    )
-                    if response.status_code == 200:
-                        closed_positions = response.json()
-                except Exception:
-                    closed_positions = []
-
-                try:
-                    response = await client.get(
-                        "https://data-api.polymarket.com/value",
-                        params={"user": address},
-                    )
-                    if response.status_code == 200:
-                        payload = response.json()
-                        if isinstance(payload, list) and payload:
-                            value_total = _parse_float(payload[0].get("value") or 0)
-                except Exception:
-                    value_total = 0.0
-
-            positions = positions if isinstance(positions, list) else []
-            closed_positions = closed_positions if isinstance(closed_positions, list) else []
-            global_pnl, global_roi, total_balance = _compute_global_stats(positions, closed_positions)
-            if value_total > 0:
-                total_balance = value_total
-            return address, global_pnl, global_roi, total_balance
-
-        stats_results = await asyncio.gather(*[fetch_user_stats(t["address"]) for t in top_traders])
-        stats_map = {address: (pnl, roi, balance) for address, pnl, roi, balance in stats_results}
+        positions = positions if isinstance(positions, list) else []
+        closed_positions = closed_positions if isinstance(closed_positions, list) else []
+        global_pnl, global_roi, total_balance = _compute_global_stats(positions, closed_positions)
+        if value_total > 0:
+            total_balance = value_total
+        return address, global_pnl, global_roi, total_balance
+
+    stats_results = await asyncio.gather(*[fetch_user_stats(t["address"]) for t in top_traders])
+    stats_map = {address: (pnl, roi, balance) for address, pnl, roi, balance in stats_results}
 
     for trader in top_traders:
         bullish = trader.get("bullish_volume", 0.0)
@@ -451,36 +628,20 @@ async def _fetch_top_traders(market: Market, days: int = 7, limit: int = 500, to
     return top_traders
 
 
-@router.post("/{market_id}", response_model=DebateResponse)
-async def initiate_debate(
-    market_id: str,
-    request: Optional[DebateRequest] = None,
-    db: AsyncSession = Depends(get_db)
-) -> DebateResponse:
-    """
-    Initiates an AI debate for a specific market.
-    
-    Users can optionally specify which agents to include in the debate
-    to reduce token usage and processing time.
-    """
-    # 1. Fetch Market Data
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
-    
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
-        
-    if not market:
-        raise HTTPException(status_code=404, detail="Market not found")
-    
-    # 2. Fetch Price History for Statistics Expert
+# Constant initial-state fields. "messages" is left out on purpose: the graph's
+# message channel starts out empty, so no per-request list is needed.
+_STATE_TEMPLATE = MappingProxyType({"verdict": ""})
+
+
+async def _prepare_initial_state(market: dict) -> DebateState:
+    """Gather price history and top traders for a market into the graph's initial state."""
+    # Fetch Price History for Statistics Expert
     price_history_24h: List[float] = []
     price_history_7d: List[float] = []
     
-    if market.clob_token_ids:
+    if market["clob_token_ids"]:
         try:
-            token_ids = json.loads(market.clob_token_ids)
+            token_ids = json.loads(market["clob_token_ids"])
             if token_ids and len(token_ids) > 0:
                 yes_token_id = token_ids[0]
                 
@@ -498,14 +659,14 @@ async def initiate_debate(
         except Exception as e:
             logger.warning(f"Failed to fetch price history for debate: {e}")
     
-    # 3. Prepare Data for Agents
+    # Prepare Data for Agents
     market_data = {
-        "title": market.title,
-        "price": market.yes_percentage,
-        "volume_24h": market.volume_24h,
-        "volume_7d": market.volume_7d,
-        "liquidity": market.liquidity,
-        "end_date": str(market.end_date)
+        "title": market["title"],
+        "price": market["yes_percentage"],
+        "volume_24h": market["volume_24h"],
+        "volume_7d": market["volume_7d"],
+        "liquidity": market["liquidity"],
+        "end_date": market["end_date_str"]
     }
 
     top_traders = []
@@ -514,58 +675,270 @@ async def initiate_debate(
     except Exception as e:
         logger.warning(f"Failed to fetch top traders for debate: {e}")
     
-    initial_state: DebateState = {
-        "messages": [],
+    return {
+        **_STATE_TEMPLATE,
         "market_data": market_data,
-        "market_question": market.title,
-        "verdict": "",
+        "market_question": market["title"],
         "price_history_24h": price_history_24h,
         "price_history_7d": price_history_7d,
         "top_traders": top_traders,
     }
+
+
+async def _run_debate(market: dict, enabled_agents: frozenset[str]) -> tuple[list[dict], str]:
+    """
+    Gather agent inputs for a market and run the debate graph.
+
+    Returns:
+        The formatted agent messages and the moderator's verdict.
+    """
+    initial_state = await _prepare_initial_state(market)
+
+    # Run the compiled graph for this agent selection
+    debate_graph = _compiled_graph(enabled_agents)
+    final_state = await debate_graph.ainvoke(initial_state)
     
-    # 3. Build Agent Config from Request
-    agent_config: AgentConfig = {
-        "statistics_expert": True,
-        "generalist_expert": True,
-        "devils_advocate": True,
-        "crypto_macro_analyst": True,
-        "time_decay_analyst": True,
-        "top_traders_analyst": True,
-    }
-    
+    # Format Output (the graph's transcript node already filtered and flattened them)
+    formatted_messages = [
+        {"agent": name, "content": content} for name, content in final_state["named_messages"]
+    ]
+    return formatted_messages, final_state.get("verdict", "No verdict reached.")
+
+
+async def _single_flight(key: tuple, run: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run `run()` once per key; concurrent callers with the same key await its result.
+
+    The work runs in its own task and every caller awaits it through a shield,
+    so a caller that is cancelled (e.g. its client disconnected) leaves the
+    run, and the other callers waiting on it, untouched.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(run())
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _finish_flight(key, t))
+    return await asyncio.shield(task)
+
+
+def _finish_flight(key: tuple, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the outcome retrieved in case every caller was cancelled meanwhile
+    if not task.cancelled():
+        task.exception()
+
+
+async def _load_debate_target(
+    market_id: str, request: Optional[DebateRequest]
+) -> tuple[dict, List[str]]:
+    """Resolve the market snapshot and the enabled agent names for a debate request."""
+    market = await _get_market_snapshot(market_id)
+    if not market:
+        raise HTTPException(status_code=404, detail="Market not found")
+
     if request and request.agents:
-        agent_config = {
-            "statistics_expert": request.agents.statistics_expert,
-            "generalist_expert": request.agents.generalist_expert,
-            "devils_advocate": request.agents.devils_advocate,
-            "crypto_macro_analyst": request.agents.crypto_macro_analyst,
-            "time_decay_analyst": request.agents.time_decay_analyst,
-            "top_traders_analyst": request.agents.top_traders_analyst,
-        }
-    
-    # Track enabled agents for response
-    enabled_agents = [k for k, v in agent_config.items() if v]
-    
-    # 4. Build Dynamic Graph and Run
-    try:
-        debate_graph = build_debate_graph(agent_config)
-        final_state = await debate_graph.ainvoke(initial_state)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Debate failed: {str(e)}")
-    
-    # 5. Format Output
-    formatted_messages = []
-    for msg in final_state["messages"]:
-        if isinstance(msg, HumanMessage) and msg.name:
-            formatted_messages.append({
-                "agent": msg.name,
-                "content": str(msg.content)
-            })
-            
-    return DebateResponse(
+        agent_config: AgentConfig = request.agents.model_dump()
+    else:
+        agent_config = dict(_DEFAULT_AGENT_CONFIG)
+
+    return market, [k for k, v in agent_config.items() if v]
+
+
+async def _debate_outcome(
+    market_id: str, market: dict, enabled_agents: List[str], full: bool = False
+) -> DebateResponse:
+    """
+    Run the debate (or join / reuse an identical one) and build the response.
+
+    Message contents are capped at MAX_CONTENT characters unless `full` is set;
+    cached results always keep the full text.
+    """
+    key = (market["id"], frozenset(enabled_agents))
+    outcome = _debate_results.get(key)
+    if outcome is None:
+        outcome = await _single_flight(key, lambda: _run_debate(market, key[1]))
+        _debate_results.set(key, outcome)
+    formatted_messages, verdict = outcome
+    if not full:
+        formatted_messages = [
+            m if len(m["content"]) <= MAX_CONTENT
+            else {"agent": m["agent"], "content": m["content"][:MAX_CONTENT] + "…"}
+            for m in formatted_messages
+        ]
+
+    # Fields are built here from known-typed values, so skip re-validation
+    return DebateResponse.model_construct(
         market_id=market_id,
         messages=formatted_messages,
-        verdict=final_state.get("verdict", "No verdict reached."),
+        verdict=verdict,
         enabled_agents=enabled_agents
     )
+
+
+def _debate_error(market_id: str, exc: BaseException) -> HTTPException:
+    """
+    Log a failed debate and map it to a small, fixed error body.
+
+    Provider error text can be large and may echo request details, so it only
+    goes to the log, never to the client.
+    """
+    logger.error(f"Debate failed for market {market_id}", exc_info=exc)
+    return HTTPException(status_code=500, detail={"error": "debate_failed", "market_id": market_id})
+
+
+async def _debate_job(
+    market_id: str, market: dict, enabled_agents: List[str], full: bool
+) -> DebateResponse | HTTPException:
+    """
+    Run a background debate, mapping a failure to its HTTP error once.
+
+    The job keeps the mapped error as its result, so polling a failed job
+    neither re-logs the traceback nor rebuilds the response.
+    """
+    try:
+        return await _debate_outcome(market_id, market, enabled_agents, full)
+    except Exception as e:
+        return _debate_error(market_id, e)
+
+
+@router.post("/{market_id}", response_model=DebateResponse, response_class=ORJSONResponse)
+async def initiate_debate(
+    market_id: str,
+    request: Optional[DebateRequest] = None,
+    full: bool = Query(
+        default=False,
+        description=f"Return full agent messages instead of capping each at {MAX_CONTENT} characters"
+    ),
+) -> DebateResponse:
+    """
+    Initiates an AI debate for a specific market.
+    
+    Users can optionally specify which agents to include in the debate
+    to reduce token usage and processing time. Concurrent requests for the
+    same market and agent selection share one run, and results are reused
+    for a short window afterwards.
+    """
+    _REQUEST_CACHE.set({})
+    market, enabled_agents = await _load_debate_target(market_id, request)
+
+    try:
+        return await _debate_outcome(market_id, market, enabled_agents, full)
+    except Exception as e:
+        raise _debate_error(market_id, e)
+
+
+@router.post("/{market_id}/jobs", response_model=DebateJob, status_code=202)
+async def submit_debate_job(
+    market_id: str,
+    request: Optional[DebateRequest] = None,
+    full: bool = Query(
+        default=False,
+        description=f"Return full agent messages instead of capping each at {MAX_CONTENT} characters"
+    ),
+) -> DebateJob:
+    """
+    Starts a debate in the background and returns a job ID immediately.
+
+    Poll `GET /api/debate/result/{job_id}` for the outcome.
+    """
+    _REQUEST_CACHE.set({})
+    market, enabled_agents = await _load_debate_target(market_id, request)
+
+    job_id = uuid4().hex
+    task = asyncio.create_task(_debate_job(market_id, market, enabled_agents, full))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    _debate_jobs.set(job_id, (market_id, task))
+    return DebateJob.model_construct(job_id=job_id, status="pending")
+
+
+@router.get(
+    "/result/{job_id}",
+    response_model=DebateResponse,
+    response_class=ORJSONResponse,
+    responses={202: {"model": DebateJob, "description": "Debate still running"}},
+)
+async def get_debate_result(job_id: str) -> DebateResponse:
+    """
+    Returns the result of a background debate job.
+
+    Responds with 202 while the debate is still running.
+    """
+    job = _debate_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    market_id, task = job
+
+    if not task.done():
+        return ORJSONResponse(status_code=202, content={"job_id": job_id, "status": "pending"})
+
+    if task.cancelled():
+        raise HTTPException(
+            status_code=500, detail={"error": "debate_cancelled", "market_id": market_id}
+        )
+    outcome = task.result()
+    if isinstance(outcome, HTTPException):
+        raise HTTPException(status_code=outcome.status_code, detail=outcome.detail)
+    return outcome
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/{market_id}/stream")
+async def stream_debate(
+    market_id: str,
+    agents: Optional[List[str]] = Query(
+        default=None,
+        description="Agents to include (e.g. statistics_expert). If not provided, all agents are enabled."
+    ),
+) -> StreamingResponse:
+    """
+    Streams an AI debate for a specific market as Server-Sent Events.
+
+    Emits `delta` events with each agent's tokens as they are generated and a
+    final `done` event carrying the verdict (or an `error` event on failure).
+    """
+    unknown_agents = sorted(set(agents or ()) - AGENT_NODES.keys())
+    if unknown_agents:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown agents: {', '.join(unknown_agents)}"
+        )
+
+    _REQUEST_CACHE.set({})
+
+    market = await _get_market_snapshot(market_id)
+    if not market:
+        raise HTTPException(status_code=404, detail="Market not found")
+
+    if agents:
+        enabled_agents = frozenset(agents)
+    else:
+        enabled_agents = frozenset(k for k, v in _DEFAULT_AGENT_CONFIG.items() if v)
+    debate_graph = _compiled_graph(enabled_agents)
+
+    async def event_gen():
+        try:
+            initial_state = await _prepare_initial_state(market)
+            async for ev in debate_graph.astream_events(initial_state, version="v2"):
+                kind = ev["event"]
+                if kind == "on_chat_model_stream":
+                    content = ev["data"]["chunk"].content
+                    if content:
+                        yield _sse("delta", {
+                            "agent": ev.get("metadata", {}).get("langgraph_node", ev["name"]),
+                            "delta": content if isinstance(content, str) else str(content),
+                        })
+                elif kind == "on_chain_end" and not ev.get("parent_ids"):
+                    output = ev["data"].get("output") or {}
+                    yield _sse("done", {
+                        "market_id": market_id,
+                        "verdict": output.get("verdict", "No verdict reached."),
+                        "enabled_agents": [a for a in AGENT_ORDER if a in enabled_agents],
+                    })
+        except Exception as e:
+            yield _sse("error", _debate_error(market_id, e).detail)
+
+    return StreamingResponse(event_gen(), media_type="text/event-stream")
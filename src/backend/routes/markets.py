@@ -5,19 +5,39 @@ Provides endpoints for fetching top 50 markets, individual market details, and p
 """
 
 import asyncio
-import json
+import heapq
 import logging
-from datetime import datetime, timedelta
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Final
 
 import httpx
+import numpy as np
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.backend.cache import user_stats_cache
+from sqlalchemy.orm import InstrumentedAttribute, aliased, load_only
+
+from src.backend.cache import (
+    cached_response,
+    market_holders_cache,
+    market_slug_ids,
+    market_snapshot_cache,
+    market_stats_cache,
+    market_trades_cache,
+    price_history_cache,
+    top_markets_cache,
+    user_stats_cache,
+)
 from src.backend.database import get_db
-from src.backend.models import AppState, Market
+from src.backend.http_clients import clob_http, data_api_http
+from src.backend.models import AppState, Market, PriceHistory
 from src.backend.polymarket.client import polymarket_client
 from src.backend.polymarket.schemas import MarketListResponse, MarketOut, MarketStatusResponse
 
@@ -25,9 +45,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/markets", tags=["markets"])
 
-CLOB_API_URL = "https://clob.polymarket.com"
-
-
 class PricePoint(BaseModel):
     """Single price/percentage point in time."""
 
@@ -43,6 +60,14 @@ class PriceHistoryResponse(BaseModel):
     history: list[PricePoint]
     timeframe: str
 
+# Timeframe -> CLOB (interval, fidelity in minutes)
+_TIMEFRAME_CONFIG: Final[Mapping[str, tuple[str, int]]] = MappingProxyType({
+    "24H": ("1d", 15),    # 1 day with 15-minute fidelity
+    "7D": ("7d", 60),     # 7 days with 1-hour fidelity
+    "1M": ("30d", 240),   # 30 days with 4-hour fidelity
+    "ALL": ("max", 1440), # All time with 1-day fidelity
+})
+
 
 def _parse_float(value: object) -> float:
     try:
@@ -110,17 +135,39 @@ def _extract_closed_position_pnl(position: dict) -> float:
     return 0.0
 
 
+def _find_market_position(positions: list[dict], condition_id: str) -> dict | None:
+    """Return the open position held in the given market, if any."""
+    for position in positions:
+        if isinstance(position, dict) and position.get("conditionId") == condition_id:
+            return position
+    return None
+
+
 def _compute_global_stats(
     positions: list[dict],
     closed_positions: list[dict] | None = None,
-) -> tuple[float, float, float]:
+    condition_id: str | None = None,
+) -> tuple[float, float, float, dict | None]:
+    """
+    Aggregate a user's PnL, ROI and balance across all of their positions.
+
+    When `condition_id` is given, the first open position in that market is
+    picked up during the same pass and returned as the last element.
+    """
     global_pnl = 0.0
     total_cost_basis = 0.0
     total_balance = 0.0
+    market_position = None
 
     for position in positions:
         if not isinstance(position, dict):
             continue
+        if (
+            market_position is None
+            and condition_id is not None
+            and position.get("conditionId") == condition_id
+        ):
+            market_position = position
         global_pnl += _extract_position_pnl(position)
 
         initial_val = _parse_float(position.get("initialValue") or 0)
@@ -143,10 +190,82 @@ def _compute_global_stats(
         total_balance = max(0.0, total_cost_basis + global_pnl)
 
     global_roi = (global_pnl / total_cost_basis * 100) if total_cost_basis > 0 else 0.0
-    return global_pnl, global_roi, total_balance
+    return global_pnl, global_roi, total_balance, market_position
+
+
+# Max concurrent data-api requests per /holders call
+_DATA_API_CONCURRENCY = 20
+
+# Trade outcome polarity: +1 for Yes-like outcomes, -1 for No-like ones
+_OUTCOME_POLARITY: Final[Mapping[str, int]] = MappingProxyType(
+    {"yes": 1, "up": 1, "no": -1, "down": -1}
+)
+
+# Trade side -> (canonical side, outcome polarity the side is bullish on)
+_TRADE_SIDES: Final[Mapping[str, tuple[str, int]]] = MappingProxyType(
+    {"buy": ("BUY", 1), "sell": ("SELL", -1)}
+)
+
+# Market IDs are normally CLOB condition IDs (0x + 64 hex chars)
+CONDITION_ID_RE = re.compile(r"^0x[a-fA-F0-9]{64}$")
+
+
+async def _get_market_by_id_or_slug(
+    db: AsyncSession, market_id: str, *columns: InstrumentedAttribute
+) -> Market | None:
+    """
+    Look up a market by ID or slug in one query; an exact ID match wins.
+
+    When `columns` are given only those (plus the primary key) are loaded,
+    so callers that read a handful of fields skip hydrating the rest.
+    """
+    stmt = select(Market)
+    if columns:
+        stmt = stmt.options(load_only(*columns))
+
+    # Slugs of active markets resolve to their ID in memory, so the common
+    # case is a primary-key lookup
+    known_id = market_slug_ids.get(market_id)
+    if known_id is not None:
+        result = await db.execute(stmt.where(Market.id == known_id))
+        market = result.scalar_one_or_none()
+        if market is not None:
+            return market
+
+    result = await db.execute(
+        stmt
+        .where(or_(Market.id == market_id, Market.slug == market_id))
+        .order_by((Market.id == market_id).desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+# Market columns backing MarketOut, in field order
+_MARKET_OUT_FIELDS = tuple(MarketOut.model_fields)
+_MARKET_OUT_COLUMNS = tuple(getattr(Market, f) for f in _MARKET_OUT_FIELDS)
+
+
+# Last market refresh time, as a scalar subquery to ride along with market queries
+_LAST_UPDATED = (
+    select(AppState.value)
+    .where(AppState.key == "markets_last_updated")
+    .scalar_subquery()
+    .label("last_updated")
+)
+
+
+def _parse_last_updated(value: str | None) -> datetime | None:
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except Exception:
+            pass
+    return None
 
 
 @router.get("/top50", response_model=MarketListResponse)
+@cached_response(top_markets_cache, key=lambda **_: "top")
 async def get_top_50_markets(db: AsyncSession = Depends(get_db)) -> MarketListResponse:
     """
     Get the top 100 markets by 7-day volume.
@@ -156,30 +275,24 @@ async def get_top_50_markets(db: AsyncSession = Depends(get_db)) -> MarketListRe
     Returns:
         List of top 100 active markets sorted by volume.
     """
+    # Markets and the last update time come back in one round-trip. Plain
+    # columns skip ORM identity-map work; rows already match MarketOut's types.
     result = await db.execute(
-        select(Market)
+        select(*_MARKET_OUT_COLUMNS, _LAST_UPDATED)
         .where(Market.is_active == True)  # noqa: E712
         .order_by(Market.volume_7d.desc())
         .limit(100)
     )
-    markets = result.scalars().all()
-
-    # Get last update time
-    state_result = await db.execute(
-        select(AppState).where(AppState.key == "markets_last_updated")
-    )
-    state = state_result.scalar_one_or_none()
-    last_updated = None
-    if state:
-        try:
-            last_updated = datetime.fromisoformat(state.value)
-        except Exception:
-            pass
+    rows = result.all()
+    markets = [
+        MarketOut.model_construct(**{f: row[i] for i, f in enumerate(_MARKET_OUT_FIELDS)})
+        for row in rows
+    ]
 
-    return MarketListResponse(
-        markets=[MarketOut.model_validate(m) for m in markets],
+    return MarketListResponse.model_construct(
+        markets=markets,
         total=len(markets),
-        last_updated=last_updated,
+        last_updated=_parse_last_updated(rows[0][-1] if rows else None),
     )
 
 
@@ -191,25 +304,15 @@ async def get_market_status(db: AsyncSession = Depends(get_db)) -> MarketStatusR
     Returns:
         Last update time and market count.
     """
-    # Count markets
-    result = await db.execute(select(Market).where(Market.is_active == True))  # noqa: E712
-    markets = result.scalars().all()
-
-    # Get last update time
-    state_result = await db.execute(
-        select(AppState).where(AppState.key == "markets_last_updated")
+    # Count active markets in SQL; the last update time rides along in the same row
+    result = await db.execute(
+        select(func.count(Market.id), _LAST_UPDATED).where(Market.is_active == True)  # noqa: E712
     )
-    state = state_result.scalar_one_or_none()
-    last_updated = None
-    if state:
-        try:
-            last_updated = datetime.fromisoformat(state.value)
-        except Exception:
-            pass
+    market_count, last_updated = result.one()
 
     return MarketStatusResponse(
-        last_updated=last_updated,
-        market_count=len(markets),
+        last_updated=_parse_last_updated(last_updated),
+        market_count=market_count,
         status="ok",
     )
 
@@ -229,24 +332,103 @@ async def fetch_price_history_from_clob(
         List of {t: timestamp, p: price} dicts.
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{CLOB_API_URL}/prices-history",
-                params={
-                    "market": token_id,
-                    "interval": interval,
-                    "fidelity": fidelity,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("history", [])
+        response = await clob_http.get().get(
+            "/prices-history",
+            params={
+                "market": token_id,
+                "interval": interval,
+                "fidelity": fidelity,
+            },
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        return data.get("history", [])
     except Exception as e:
         logger.error(f"Failed to fetch price history from CLOB: {e}")
         return []
 
 
+@dataclass(frozen=True, slots=True)
+class _WindowStats:
+    """Price summary (in %) over one stats window."""
+
+    count: int
+    first: float
+    last: float
+    high: float
+    low: float
+    latest_ts: float
+
+
+def _summarize_window(timestamps: np.ndarray, prices: np.ndarray) -> _WindowStats | None:
+    """Summarize a timestamp-sorted price series; None when it is empty."""
+    if not prices.size:
+        return None
+    return _WindowStats(
+        count=int(prices.size),
+        first=float(prices[0]),
+        last=float(prices[-1]),
+        high=float(prices.max()),
+        low=float(prices.min()),
+        latest_ts=float(timestamps[-1]),
+    )
+
+
+def _window_columns(market_id: str, since: datetime) -> tuple:
+    """Aggregate columns summarizing local price history recorded since `since`."""
+    in_window = PriceHistory.timestamp >= since
+    # Aliased so first/last stay uncorrelated from the outer price_history scan
+    ph = aliased(PriceHistory)
+    ordered = select(ph.yes_percentage).where(ph.market_id == market_id, ph.timestamp >= since)
+    return (
+        func.count().filter(in_window),
+        ordered.order_by(ph.timestamp.asc()).limit(1).scalar_subquery(),
+        ordered.order_by(ph.timestamp.desc()).limit(1).scalar_subquery(),
+        func.max(PriceHistory.yes_percentage).filter(in_window),
+        func.min(PriceHistory.yes_percentage).filter(in_window),
+        func.max(PriceHistory.timestamp).filter(in_window),
+    )
+
+
+async def _local_window_stats(
+    db: AsyncSession, market_id: str
+) -> tuple[_WindowStats | None, _WindowStats | None]:
+    """
+    Summarize the locally recorded price history for the 24h and 7d windows.
+
+    The reduction runs in the database in a single query over the
+    (market_id, timestamp) index, so no rows are shipped back to Python.
+
+    Returns:
+        (24h stats, 7d stats), each None when the window has no points.
+    """
+    now = datetime.utcnow()
+    since_7d = now - timedelta(days=7)
+    result = await db.execute(
+        select(
+            *_window_columns(market_id, now - timedelta(hours=24)),
+            *_window_columns(market_id, since_7d),
+        ).where(PriceHistory.market_id == market_id, PriceHistory.timestamp >= since_7d)
+    )
+    row = result.one()
+
+    def to_stats(count, first, last, high, low, latest) -> _WindowStats | None:
+        if not count:
+            return None
+        latest_ts = latest.replace(tzinfo=timezone.utc).timestamp()
+        return _WindowStats(count, first, last, high, low, latest_ts)
+
+    return to_stats(*row[:6]), to_stats(*row[6:])
+
+
 @router.get("/{market_id}/history", response_model=PriceHistoryResponse)
+@cached_response(
+    price_history_cache,
+    key=lambda market_id, timeframe, **_: (market_id, timeframe),
+    # Only real CLOB histories (pre-encoded responses); the current-price
+    # fallbacks are cheap and must not outlive an upstream blip
+    should_cache=lambda response: isinstance(response, ORJSONResponse),
+)
 async def get_price_history(
     market_id: str,
     timeframe: str = Query(default="24H", pattern="^(24H|7D|1M|ALL)$"),
@@ -263,7 +445,18 @@ async def get_price_history(
         Price history data points.
     """
     # Get market to find CLOB token ID
-    result = await db.execute(select(Market).where(Market.id == market_id))
+    result = await db.execute(
+        select(Market)
+        .options(
+            load_only(
+                Market.clob_token_ids,
+                Market.yes_percentage,
+                Market.volume_24h,
+                Market.last_updated,
+            )
+        )
+        .where(Market.id == market_id)
+    )
     market = result.scalar_one_or_none()
 
     if not market:
@@ -285,7 +478,7 @@ async def get_price_history(
         )
 
     try:
-        token_ids = json.loads(market.clob_token_ids)
+        token_ids = orjson.loads(market.clob_token_ids)
         if not token_ids or len(token_ids) == 0:
             raise ValueError("Empty token IDs")
         # First token is typically the "Yes" outcome
@@ -305,13 +498,7 @@ async def get_price_history(
         )
 
     # Map timeframe to CLOB API parameters
-    timeframe_config = {
-        "24H": ("1d", 15),    # 1 day with 15-minute fidelity
-        "7D": ("7d", 60),     # 7 days with 1-hour fidelity
-        "1M": ("30d", 240),   # 30 days with 4-hour fidelity
-        "ALL": ("max", 1440), # All time with 1-day fidelity
-    }
-    interval, fidelity = timeframe_config.get(timeframe, ("1d", 15))
+    interval, fidelity = _TIMEFRAME_CONFIG.get(timeframe, _TIMEFRAME_CONFIG["24H"])
 
     # Fetch from CLOB API
     history_data = await fetch_price_history_from_clob(yes_token_id, interval, fidelity)
@@ -332,21 +519,23 @@ async def get_price_history(
 
     # No additional filtering needed - CLOB API handles timeframes directly
 
-    # Convert to PricePoint format
+    # Build PricePoint-shaped dicts and encode them directly; the CLOB output is
+    # already well-formed, so per-point model validation is skipped. Timestamps
+    # and prices are converted in one vectorized pass each.
+    n = len(history_data)
+    timestamps = np.datetime_as_string(
+        np.fromiter((h["t"] for h in history_data), dtype=np.int64, count=n).astype("datetime64[s]")
+    ).tolist()
+    prices = (  # Convert 0-1 to percentage
+        np.fromiter((h["p"] for h in history_data), dtype=np.float64, count=n) * 100
+    ).tolist()
     history = [
-        PricePoint(
-            timestamp=datetime.utcfromtimestamp(h["t"]),
-            yes_percentage=h["p"] * 100,  # Convert 0-1 to percentage
-            volume=0.0,  # CLOB doesn't provide volume per point
-        )
-        for h in history_data
+        # CLOB doesn't provide volume per point
+        {"timestamp": ts, "yes_percentage": p, "volume": 0.0}
+        for ts, p in zip(timestamps, prices)
     ]
 
-    return PriceHistoryResponse(
-        market_id=market_id,
-        history=history,
-        timeframe=timeframe,
-    )
+    return ORJSONResponse({"market_id": market_id, "history": history, "timeframe": timeframe})
 
 
 class MarketSignal(BaseModel):
@@ -388,6 +577,7 @@ class MarketStats(BaseModel):
 
 
 @router.get("/{market_id}/stats")
+@cached_response(market_stats_cache, key=lambda market_id, **_: market_id)
 async def get_market_stats(
     market_id: str,
     db: AsyncSession = Depends(get_db)
@@ -399,12 +589,14 @@ async def get_market_stats(
     based on 24h and 7d price action and volume.
     """
     # Get market
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
-    
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
+    market = await _get_market_by_id_or_slug(
+        db,
+        market_id,
+        Market.yes_percentage,
+        Market.volume_24h,
+        Market.volume_7d,
+        Market.clob_token_ids,
+    )
     
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
@@ -419,51 +611,54 @@ async def get_market_stats(
     
     if market.clob_token_ids:
         try:
-            token_ids = json.loads(market.clob_token_ids)
+            token_ids = orjson.loads(market.clob_token_ids)
             if token_ids:
                 yes_token_id = token_ids[0]
                 # Fetch both timeframes in parallel
                 history_24h, history_7d = await asyncio.gather(
-                    fetch_price_history_from_clob(yes_token_id, "1d", 15),
-                    fetch_price_history_from_clob(yes_token_id, "7d", 60),
+                    fetch_price_history_from_clob(yes_token_id, *_TIMEFRAME_CONFIG["24H"]),
+                    fetch_price_history_from_clob(yes_token_id, *_TIMEFRAME_CONFIG["7D"]),
                 )
         except Exception as e:
             logger.warning(f"Failed to fetch history for stats: {e}")
     
-    def normalize_history(history: list[dict]) -> list[tuple[int, float]]:
+    def normalize_history(history: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        """Return (timestamps, prices in %) as arrays sorted by timestamp."""
         points: list[tuple[int, float]] = []
         for item in history:
             if not isinstance(item, dict):
                 continue
             try:
-                ts = int(item.get("t"))
-                price = float(item.get("p")) * 100
+                points.append((int(item.get("t")), float(item.get("p"))))
             except (TypeError, ValueError):
                 continue
-            points.append((ts, price))
-        points.sort(key=lambda x: x[0])
-        return points
-
-    history_24h_points = normalize_history(history_24h)
-    history_7d_points = normalize_history(history_7d)
-
-    # Use the latest available point from CLOB for a more accurate current price
-    latest_ts = None
-    if history_24h_points:
-        latest_ts, current_price = history_24h_points[-1]
-    if history_7d_points:
-        ts_7d, price_7d = history_7d_points[-1]
-        if latest_ts is None or ts_7d > latest_ts:
-            latest_ts, current_price = ts_7d, price_7d
+        if not points:
+            return np.empty(0), np.empty(0)
+        arr = np.array(points, dtype=np.float64)
+        arr = arr[np.argsort(arr[:, 0], kind="stable")]
+        return arr[:, 0], arr[:, 1] * 100
+
+    stats_24h = _summarize_window(*normalize_history(history_24h))
+    stats_7d = _summarize_window(*normalize_history(history_7d))
+    if stats_24h is None and stats_7d is None:
+        # No CLOB data; fall back to the snapshots recorded by the market updater
+        stats_24h, stats_7d = await _local_window_stats(db, market.id)
+
+    # Use the latest available point for a more accurate current price
+    latest = max(
+        (s for s in (stats_24h, stats_7d) if s is not None),
+        key=lambda s: s.latest_ts,
+        default=None,
+    )
+    if latest is not None:
+        current_price = latest.last
 
     # Calculate 24h stats
-    if len(history_24h_points) > 1:
-        prices_24h = [price for _, price in history_24h_points]
-        first_24h = prices_24h[0]
-        last_24h = prices_24h[-1]
-        high_24h = max(prices_24h)
-        low_24h = min(prices_24h)
-        change_24h = last_24h - first_24h
+    if stats_24h and stats_24h.count > 1:
+        first_24h = stats_24h.first
+        high_24h = stats_24h.high
+        low_24h = stats_24h.low
+        change_24h = stats_24h.last - first_24h
         change_24h_percent = (change_24h / first_24h * 100) if first_24h > 0 else 0
     else:
         high_24h = current_price
@@ -473,13 +668,11 @@ async def get_market_stats(
         change_24h_percent = 0
     
     # Calculate 7d stats
-    if len(history_7d_points) > 1:
-        prices_7d = [price for _, price in history_7d_points]
-        first_7d = prices_7d[0]
-        last_7d = prices_7d[-1]
-        high_7d = max(prices_7d)
-        low_7d = min(prices_7d)
-        change_7d = last_7d - first_7d
+    if stats_7d and stats_7d.count > 1:
+        first_7d = stats_7d.first
+        high_7d = stats_7d.high
+        low_7d = stats_7d.low
+        change_7d = stats_7d.last - first_7d
         change_7d_percent = (change_7d / first_7d * 100) if first_7d > 0 else 0
     else:
         high_7d = current_price
@@ -556,7 +749,7 @@ async def get_market_stats(
         ))
     
     # Signal 3: Price Position (relative to range)
-    if history_7d and len(history_7d) > 5:
+    if stats_7d and stats_7d.count > 5:
         range_7d = high_7d - low_7d
         if range_7d > 0:
             position = (current_price - low_7d) / range_7d
@@ -612,9 +805,8 @@ async def get_market_stats(
             ))
     
     # Signal 5: Volatility
-    if history_24h and len(history_24h) > 10:
-        prices = [h["p"] * 100 for h in history_24h]
-        volatility = max(prices) - min(prices)
+    if stats_24h and stats_24h.count > 10:
+        volatility = stats_24h.high - stats_24h.low
         if volatility > 5:
             signals.append(MarketSignal(
                 name="High Volatility",
@@ -673,14 +865,8 @@ async def get_market(market_id: str, db: AsyncSession = Depends(get_db)) -> Mark
     Returns:
         Market details.
     """
-    # Try by ID first
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
-
-    # Try by slug if not found
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
+    # Try by ID, then slug, in one query
+    market = await _get_market_by_id_or_slug(db, market_id)
 
     # If still not found in DB, try fetching from API (assuming market_id might be a slug)
     if not market:
@@ -695,7 +881,7 @@ async def get_market(market_id: str, db: AsyncSession = Depends(get_db)) -> Mark
                 yes_percentage = 50.0
                 if api_market.outcome_prices:
                     try:
-                        prices = json.loads(api_market.outcome_prices)
+                        prices = orjson.loads(api_market.outcome_prices)
                         if prices and len(prices) > 0:
                             price_val = float(prices[0])
                             if 0 <= price_val <= 1:
@@ -782,7 +968,7 @@ async def get_market(market_id: str, db: AsyncSession = Depends(get_db)) -> Mark
             yes_percentage = 50.0
             if api_market.outcome_prices:
                 try:
-                    prices = json.loads(api_market.outcome_prices)
+                    prices = orjson.loads(api_market.outcome_prices)
                     if prices and len(prices) > 0:
                         price_val = float(prices[0])
                         if 0 <= price_val <= 1:
@@ -808,6 +994,8 @@ async def get_market(market_id: str, db: AsyncSession = Depends(get_db)) -> Mark
             # Commit updates
             await db.commit()
             await db.refresh(market)
+            for key in {market_id, market.id, market.slug}:
+                market_snapshot_cache.pop(key)
             logger.info(f"Refreshed market data for {market.slug}: {market.yes_percentage}%")
             
     except Exception as e:
@@ -817,6 +1005,13 @@ async def get_market(market_id: str, db: AsyncSession = Depends(get_db)) -> Mark
 
 
 @router.get("/{market_id}/trades")
+@cached_response(
+    market_trades_cache,
+    key=lambda market_id, min_volume, limit, days, include_user_stats, **_: (
+        market_id, min_volume, limit, days, include_user_stats
+    ),
+    should_cache=bool,
+)
 async def get_market_trades(
     market_id: str, 
     min_volume: float = 100.0,
@@ -838,12 +1033,7 @@ async def get_market_trades(
     """
     try:
         # Get market to find slug
-        result = await db.execute(select(Market).where(Market.id == market_id))
-        market = result.scalar_one_or_none()
-
-        if not market:
-            result = await db.execute(select(Market).where(Market.slug == market_id))
-            market = result.scalar_one_or_none()
+        market = await _get_market_by_id_or_slug(db, market_id, Market.slug)
 
         if not market:
             raise HTTPException(status_code=404, detail="Market not found")
@@ -906,7 +1096,23 @@ async def get_market_trades(
 
         whale_trades = []
         seen_trade_keys: set[str] = set()
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+        # Drop trades outside the lookback window in one vectorized pass. Epoch
+        # timestamps (seconds or milliseconds) are the norm; anything else is
+        # NaN here and left for the per-trade ISO parsing below.
+        if trades:
+            ts_raw = np.array(
+                [
+                    ts if isinstance(ts, (int, float)) and not isinstance(ts, bool) else np.nan
+                    for ts in (t.get("timestamp") for t in trades)
+                ],
+                dtype=np.float64,
+            )
+            ts_sec = np.where(ts_raw > 10**12, ts_raw // 1000, ts_raw)
+            cutoff_sec = cutoff.timestamp()
+            stale = ts_sec < cutoff_sec  # NaN compares False, so it's kept
+            trades = [t for t, old in zip(trades, stale.tolist()) if not old]
         
         for trade in trades:
             try:
@@ -922,25 +1128,28 @@ async def get_market_trades(
                 if not ts_val:
                     continue
                     
-                trade_time = None
+                # Timestamps are kept UTC-aware. Epoch values were already
+                # window-checked above; fromisoformat accepts a trailing "Z".
                 if isinstance(ts_val, (int, float)):
                     ts_int = int(ts_val)
                     if ts_int > 10**12:
                         ts_int = ts_int // 1000
-                    trade_time = datetime.utcfromtimestamp(ts_int)
+                    trade_time = datetime.fromtimestamp(ts_int, tz=timezone.utc)
                 else:
                     try:
-                        trade_time = datetime.fromisoformat(str(ts_val).replace("Z", "+00:00"))
+                        trade_time = datetime.fromisoformat(str(ts_val))
                     except ValueError:
                         continue
-                    
-                if trade_time < cutoff:
-                    continue
+                    if trade_time.tzinfo is None:
+                        trade_time = trade_time.replace(tzinfo=timezone.utc)
+                    if trade_time < cutoff:
+                        continue
 
                 # Get trade details
-                side = trade.get("side", "").upper()
-                if side not in ("BUY", "SELL"):
+                side_info = _TRADE_SIDES.get(trade.get("side", "").lower())
+                if side_info is None:
                     continue
+                side, bullish_polarity = side_info
 
                 outcome = trade.get("outcome", "")
                 
@@ -959,14 +1168,8 @@ async def get_market_trades(
                 # Determine bullish/bearish sentiment
                 # Bullish = Buying Yes OR Selling No
                 # Bearish = Buying No OR Selling Yes
-                outcome_lower = outcome.lower() if outcome else ""
-                is_yes = outcome_lower in ("yes", "up")
-                is_no = outcome_lower in ("no", "down")
-                
-                if side == "BUY":
-                    is_bullish = is_yes
-                else:  # SELL
-                    is_bullish = is_no
+                polarity = _OUTCOME_POLARITY.get(str(outcome).casefold() if outcome else "", 0)
+                is_bullish = polarity == bullish_polarity
 
                 # Get user info
                 address = (
@@ -999,13 +1202,17 @@ async def get_market_trades(
                     "size": round(size, 2),
                     "price": round(price, 4),
                     "volume": round(volume, 2),
-                    "timestamp": trade_time.isoformat() + "Z"
+                    "timestamp": trade_time.astimezone(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
                 })
 
             except Exception as e:
                 logger.debug(f"Error processing trade: {e}")
                 continue
 
+        # Keep the 50 newest (O(N log 50) rather than a full sort), before
+        # enrichment so user stats are only fetched for trades we return
+        whale_trades = heapq.nlargest(50, whale_trades, key=lambda x: x["timestamp"])
+
         if include_user_stats and whale_trades:
             addresses = {
                 trade.get("address")
@@ -1030,90 +1237,87 @@ async def get_market_trades(
                 }
 
                 if uncached_addresses:
-                    async with httpx.AsyncClient(timeout=15.0) as client:
-                        semaphore = asyncio.Semaphore(10)
-
-                        async def fetch_user_stats(address: str):
-                            async with semaphore:
+                    client = data_api_http.get()
+                    semaphore = asyncio.Semaphore(10)
+
+                    async def fetch_user_stats(address: str):
+                        async with semaphore:
+                            positions = []
+                            closed_positions = []
+                            value_total = 0.0
+
+                            try:
+                                response = await client.get(
+                                    "/positions",
+                                    params={"user": address, "limit": "500"},
+                                )
+                                if response.status_code == 200:
+                                    positions = orjson.loads(response.content)
+                            except Exception:
                                 positions = []
+
+                            try:
+                                response = await client.get(
+                                    "/closed-positions",
+                                    params={"user": address, "limit": "500"},
+                                )
+                                if response.status_code == 200:
+                                    closed_positions = orjson.loads(response.content)
+                            except Exception:
                                 closed_positions = []
+
+                            try:
+                                response = await client.get(
+                                    "/value",
+                                    params={"user": address},
+                                )
+                                if response.status_code == 200:
+                                    payload = orjson.loads(response.content)
+                                    if isinstance(payload, list) and payload:
+                                        value_total = _parse_float(
+                                            payload[0].get("value") or 0
+                                        )
+                            except Exception:
                                 value_total = 0.0
 
-                                try:
-                                    response = await client.get(
-                                        "https://data-api.polymarket.com/positions",
-                                        params={"user": address, "limit": "500"},
-                                    )
-                                    if response.status_code == 200:
-                                        positions = response.json()
-                                except Exception:
-                                    positions = []
-
-                                try:
-                                    response = await client.get(
-                                        "https://data-api.polymarket.com/closed-positions",
-                                        params={"user": address, "limit": "500"},
-                                    )
-                                    if response.status_code == 200:
-                                        closed_positions = response.json()
-                                except Exception:
-                                    closed_positions = []
-
-                                try:
-                                    response = await client.get(
-                                        "https://data-api.polymarket.com/value",
-                                        params={"user": address},
-                                    )
-                                    if response.status_code == 200:
-                                        payload = response.json()
-                                        if isinstance(payload, list) and payload:
-                                            value_total = _parse_float(
-                                                payload[0].get("value") or 0
-                                            )
-                                except Exception:
-                                    value_total = 0.0
-
-                            positions = positions if isinstance(positions, list) else []
-                            closed_positions = (
-                                closed_positions
-                                if isinstance(closed_positions, list)
-                                else []
-                            )
-                            global_pnl, global_roi, total_balance = _compute_global_stats(
-                                positions,
-                                closed_positions,
-                            )
-                            if value_total > 0:
-                                total_balance = value_total
-
-                            # Store in cache for future requests
-                            user_stats_cache.set(
-                                address,
-                                global_pnl=global_pnl,
-                                global_roi=global_roi,
-                                total_balance=total_balance,
-                            )
-                            return address, {
-                                "global_pnl": global_pnl,
-                                "global_roi": global_roi,
-                                "total_balance": total_balance,
-                            }
-
-                        fresh_results = await asyncio.gather(
-                            *[fetch_user_stats(addr) for addr in uncached_addresses]
+                        positions = positions if isinstance(positions, list) else []
+                        closed_positions = (
+                            closed_positions
+                            if isinstance(closed_positions, list)
+                            else []
                         )
-                        for addr, stats in fresh_results:
-                            stats_map[addr] = stats
+                        global_pnl, global_roi, total_balance, _ = _compute_global_stats(
+                            positions,
+                            closed_positions,
+                        )
+                        if value_total > 0:
+                            total_balance = value_total
+
+                        # Store in cache for future requests
+                        user_stats_cache.set(
+                            address,
+                            global_pnl=global_pnl,
+                            global_roi=global_roi,
+                            total_balance=total_balance,
+                        )
+                        return address, {
+                            "global_pnl": global_pnl,
+                            "global_roi": global_roi,
+                            "total_balance": total_balance,
+                        }
+
+                    fresh_results = await asyncio.gather(
+                        *[fetch_user_stats(addr) for addr in uncached_addresses]
+                    )
+                    for addr, stats in fresh_results:
+                        stats_map[addr] = stats
 
                 for trade in whale_trades:
                     stats = stats_map.get(trade.get("address"))
                     if stats:
                         trade.update(stats)
 
-        # Sort by timestamp (newest first)
-        whale_trades.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        return whale_trades[:50]
+        return whale_trades
 
     except HTTPException:
         raise
@@ -1123,6 +1327,11 @@ async def get_market_trades(
 
 
 @router.get("/{market_id}/holders")
+@cached_response(
+    market_holders_cache,
+    key=lambda market_id, **_: market_id,
+    should_cache=lambda r: bool(r["yes_holders"] or r["no_holders"]),
+)
 async def get_market_holders(
     market_id: str, 
     db: AsyncSession = Depends(get_db)
@@ -1130,203 +1339,218 @@ async def get_market_holders(
     """
     Get top holders for a market with PnL and ROI data.
     """
-    # Get market
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
+    client = data_api_http.get()
 
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
+    # A condition ID is almost always the market's own ID, so start the holders
+    # request while the market row is being looked up.
+    holders_task = None
+    if CONDITION_ID_RE.match(market_id):
+        holders_task = asyncio.create_task(client.get("/holders", params={"market": market_id}))
+
+    # Get market
+    try:
+        market = await _get_market_by_id_or_slug(db, market_id, Market.slug)
+    except BaseException:
+        if holders_task:
+            holders_task.cancel()
+        raise
         
     if not market:
+        if holders_task:
+            holders_task.cancel()
         raise HTTPException(status_code=404, detail="Market not found")
 
+    if holders_task and market.id != market_id:
+        holders_task.cancel()
+        holders_task = None
+
     try:
         condition_id = market.id
         market_slug = market.slug
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # 1. Fetch Holders
+        # 1. Fetch Holders
+        if holders_task:
+            response = await holders_task
+        else:
             response = await client.get(
-                "https://data-api.polymarket.com/holders",
+                "/holders",
                 params={"market": condition_id}
             )
             
-            if response.status_code != 200:
-                logger.warning(f"Failed to fetch holders: {response.status_code}")
-                return {"yes_holders": [], "no_holders": []}
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch holders: {response.status_code}")
+            return {"yes_holders": [], "no_holders": []}
                 
-            data = response.json()
+        data = orjson.loads(response.content)
             
-            # Extract unique addresses to fetch specific stats
-            # We focus on the top holders to minimize API calls
-            all_holders = []
-            for token_data in data:
-                token_holders = token_data.get("holders", [])
-                for h in token_holders:
-                    h["outcomeIndex"] = token_data.get("dummy", h.get("outcomeIndex")) # preserve outcome index
-                    all_holders.append(h)
-
-            # Deduplicate by address for fetching stats, but keep references
-            unique_addresses = {h["proxyWallet"] for h in all_holders if h.get("proxyWallet")}
-
-            # ── 2. Check cache first ─────────────────────────────────────
-            cached_map, uncached_addresses = user_stats_cache.get_many(unique_addresses)
-            logger.info(
-                f"Holders stats cache: {len(cached_map)} hits, "
-                f"{len(uncached_addresses)} misses"
-            )
-
-            # Pre-populate global stats from cache
-            global_stats_map: dict[str, tuple[float, float, float]] = {
-                addr: (entry.global_pnl, entry.global_roi, entry.total_balance)
-                for addr, entry in cached_map.items()
-            }
-
-            # We always need positions for market-specific PnL, so fetch
-            # positions for ALL addresses, but only fetch closed-positions
-            # and value for uncached ones (those are only needed for global stats).
-            user_positions_map: dict[str, list] = {}
+        # Extract unique addresses to fetch specific stats
+        # We focus on the top holders to minimize API calls
+        all_holders = []
+        for token_data in data:
+            token_holders = token_data.get("holders", [])
+            for h in token_holders:
+                h["outcomeIndex"] = token_data.get("dummy", h.get("outcomeIndex")) # preserve outcome index
+                all_holders.append(h)
+
+        # Deduplicate by address for fetching stats, but keep references
+        unique_addresses = {h["proxyWallet"] for h in all_holders if h.get("proxyWallet")}
+
+        # ── 2. Check cache first ─────────────────────────────────────
+        cached_map, uncached_addresses = user_stats_cache.get_many(unique_addresses)
+        logger.info(
+            f"Holders stats cache: {len(cached_map)} hits, "
+            f"{len(uncached_addresses)} misses"
+        )
 
-            async def fetch_positions_only(address: str):
-                """Lightweight call — only /positions (for market PnL)."""
-                try:
-                    r = await client.get(
-                        "https://data-api.polymarket.com/positions",
-                        params={"user": address, "limit": "500"},
-                    )
-                    if r.status_code == 200:
-                        return address, r.json() if isinstance(r.json(), list) else []
-                except Exception:
-                    pass
-                return address, []
+        # Pre-populate global stats from cache
+        global_stats_map: dict[str, tuple[float, float, float]] = {
+            addr: (entry.global_pnl, entry.global_roi, entry.total_balance)
+            for addr, entry in cached_map.items()
+        }
 
-            async def fetch_full_stats(address: str):
-                """Heavy call — /positions + /closed-positions + /value."""
-                positions: list = []
-                closed_positions: list = []
-                value_total = 0.0
+        # We always need positions for market-specific PnL, so fetch
+        # positions for ALL addresses, but only fetch closed-positions
+        # and value for uncached ones (those are only needed for global stats).
+        # Only each user's position in this market is kept.
+        market_positions: dict[str, dict | None] = {}
 
-                try:
-                    r = await client.get(
-                        "https://data-api.polymarket.com/positions",
-                        params={"user": address, "limit": "500"},
-                    )
-                    if r.status_code == 200:
-                        positions = r.json() if isinstance(r.json(), list) else []
-                except Exception:
-                    pass
+        # Bound in-flight data-api requests so a long holder list can't flood
+        # the shared connection pool or trip upstream rate limits
+        semaphore = asyncio.Semaphore(_DATA_API_CONCURRENCY)
 
-                try:
-                    r = await client.get(
-                        "https://data-api.polymarket.com/closed-positions",
-                        params={"user": address, "limit": "500"},
-                    )
-                    if r.status_code == 200:
-                        closed_positions = r.json() if isinstance(r.json(), list) else []
-                except Exception:
-                    pass
+        async def data_api_get(path: str, params: dict) -> httpx.Response:
+            async with semaphore:
+                return await client.get(path, params=params)
 
-                try:
-                    r = await client.get(
-                        "https://data-api.polymarket.com/value",
-                        params={"user": address},
-                    )
-                    if r.status_code == 200:
-                        payload = r.json()
-                        if isinstance(payload, list) and payload:
-                            value_total = _parse_float(payload[0].get("value") or 0)
-                except Exception:
-                    pass
+        async def fetch_positions_only(address: str):
+            """Lightweight call — only /positions (for market PnL)."""
+            try:
+                r = await data_api_get("/positions", {"user": address, "limit": "500"})
+                if r.status_code == 200:
+                    payload = orjson.loads(r.content)
+                    if isinstance(payload, list):
+                        return address, _find_market_position(payload, condition_id)
+            except Exception:
+                pass
+            return address, None
+
+        async def fetch_full_stats(address: str):
+            """Heavy call — /positions + /closed-positions + /value."""
+            positions: list = []
+            closed_positions: list = []
+            value_total = 0.0
 
-                global_pnl, global_roi, _ = _compute_global_stats(
-                    positions, closed_positions
-                )
-                total_balance = value_total if value_total > 0 else 0.0
-
-                # Store in cache for future requests
-                user_stats_cache.set(
-                    address,
-                    global_pnl=global_pnl,
-                    global_roi=global_roi,
-                    total_balance=total_balance,
-                )
+            try:
+                r = await data_api_get("/positions", {"user": address, "limit": "500"})
+                if r.status_code == 200:
+                    payload = orjson.loads(r.content)
+                    positions = payload if isinstance(payload, list) else []
+            except Exception:
+                pass
 
-                return address, positions, (global_pnl, global_roi, total_balance)
+            try:
+                r = await data_api_get("/closed-positions", {"user": address, "limit": "500"})
+                if r.status_code == 200:
+                    payload = orjson.loads(r.content)
+                    closed_positions = payload if isinstance(payload, list) else []
+            except Exception:
+                pass
 
-            # ── 3. Fan-out only the calls we actually need ───────────────
-            cached_addresses = set(cached_map.keys())
+            try:
+                r = await data_api_get("/value", {"user": address})
+                if r.status_code == 200:
+                    payload = orjson.loads(r.content)
+                    if isinstance(payload, list) and payload:
+                        value_total = _parse_float(payload[0].get("value") or 0)
+            except Exception:
+                pass
+
+            # One pass yields the global stats and this market's position
+            global_pnl, global_roi, _, market_position = _compute_global_stats(
+                positions, closed_positions, condition_id
+            )
+            total_balance = value_total if value_total > 0 else 0.0
+
+            # Store in cache for future requests
+            user_stats_cache.set(
+                address,
+                global_pnl=global_pnl,
+                global_roi=global_roi,
+                total_balance=total_balance,
+            )
 
-            # For cached addresses: only fetch /positions (1 call each)
-            pos_tasks = [fetch_positions_only(a) for a in cached_addresses]
-            # For uncached addresses: full 3-call fan-out
-            full_tasks = [fetch_full_stats(a) for a in uncached_addresses]
+            return address, market_position, (global_pnl, global_roi, total_balance)
 
-            pos_results = await asyncio.gather(*pos_tasks)
-            full_results = await asyncio.gather(*full_tasks)
+        # ── 3. Fan-out only the calls we actually need ───────────────
+        cached_addresses = set(cached_map.keys())
 
-            for addr, positions in pos_results:
-                user_positions_map[addr] = positions
+        # For cached addresses: only fetch /positions (1 call each)
+        pos_tasks = [fetch_positions_only(a) for a in cached_addresses]
+        # For uncached addresses: full 3-call fan-out
+        full_tasks = [fetch_full_stats(a) for a in uncached_addresses]
 
-            for addr, positions, stats in full_results:
-                user_positions_map[addr] = positions
-                global_stats_map[addr] = stats
+        # Both groups run concurrently
+        pos_results, full_results = await asyncio.gather(
+            asyncio.gather(*pos_tasks), asyncio.gather(*full_tasks)
+        )
 
-            # ── 4. Build holder response lists ───────────────────────────
-            yes_holders = []
-            no_holders = []
+        for addr, market_position in pos_results:
+            market_positions[addr] = market_position
 
-            for token_data in data:
-                token_holders = token_data.get("holders", [])
+        for addr, market_position, stats in full_results:
+            market_positions[addr] = market_position
+            global_stats_map[addr] = stats
 
-                for holder in token_holders:
-                    address = holder.get("proxyWallet")
-                    if not address:
-                        continue
+        # ── 4. Build holder response lists ───────────────────────────
+        yes_holders = []
+        no_holders = []
 
-                    positions = user_positions_map.get(address, [])
+        for token_data in data:
+            token_holders = token_data.get("holders", [])
 
-                    # Market-specific PnL/ROI
-                    market_pnl = 0.0
-                    market_roi = 0.0
-                    target_pos = next(
-                        (p for p in positions if p.get("conditionId") == condition_id),
-                        None,
-                    )
-                    if target_pos:
-                        market_pnl = float(target_pos.get("cashPnl") or 0)
-                        market_roi = float(target_pos.get("percentPnl") or 0)
+            for holder in token_holders:
+                address = holder.get("proxyWallet")
+                if not address:
+                    continue
 
-                    # Global stats (from cache or freshly computed)
-                    global_pnl, global_roi, total_balance = global_stats_map.get(
-                        address, (0.0, 0.0, 0.0)
-                    )
+                # Market-specific PnL/ROI
+                market_pnl = 0.0
+                market_roi = 0.0
+                target_pos = market_positions.get(address)
+                if target_pos:
+                    market_pnl = float(target_pos.get("cashPnl") or 0)
+                    market_roi = float(target_pos.get("percentPnl") or 0)
+
+                # Global stats (from cache or freshly computed)
+                global_pnl, global_roi, total_balance = global_stats_map.get(
+                    address, (0.0, 0.0, 0.0)
+                )
 
-                    holder_info = {
-                        "address": address,
-                        "name": holder.get("name") or holder.get("pseudonym") or "Unknown",
-                        "amount": float(holder.get("amount", 0)),
-                        "img": holder.get("profileImage"),
-                        "market_pnl": market_pnl,
-                        "market_roi": market_roi,
-                        "global_pnl": global_pnl,
-                        "global_roi": global_roi,
-                        "total_balance": total_balance,
-                    }
+                holder_info = {
+                    "address": address,
+                    "name": holder.get("name") or holder.get("pseudonym") or "Unknown",
+                    "amount": float(holder.get("amount", 0)),
+                    "img": holder.get("profileImage"),
+                    "market_pnl": market_pnl,
+                    "market_roi": market_roi,
+                    "global_pnl": global_pnl,
+                    "global_roi": global_roi,
+                    "total_balance": total_balance,
+                }
 
-                    if holder.get("outcomeIndex") == 0:
-                        yes_holders.append(holder_info)
-                    else:
-                        no_holders.append(holder_info)
+                if holder.get("outcomeIndex") == 0:
+                    yes_holders.append(holder_info)
+                else:
+                    no_holders.append(holder_info)
 
-            # Sort by amount desc
-            yes_holders.sort(key=lambda x: x["amount"], reverse=True)
-            no_holders.sort(key=lambda x: x["amount"], reverse=True)
+        # Sort by amount desc
+        yes_holders.sort(key=lambda x: x["amount"], reverse=True)
+        no_holders.sort(key=lambda x: x["amount"], reverse=True)
 
-            return {
-                "yes_holders": yes_holders[:20],
-                "no_holders": no_holders[:20],
-            }
+        return {
+            "yes_holders": yes_holders[:20],
+            "no_holders": no_holders[:20],
+        }
 
     except Exception as e:
         logger.error(f"Error fetching holders enriched info: {e}")
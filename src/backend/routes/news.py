@@ -5,18 +5,55 @@ Provides endpoints for fetching news related to markets.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.backend.cache import cached_response, market_news_cache
 from src.backend.database import get_db
 from src.backend.models import Market, NewsArticle
 from src.backend.news.aggregator import news_aggregator
 from src.backend.news.schemas import NewsArticleOut, NewsListResponse
+from src.backend.routes.markets import _get_market_by_id_or_slug
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
+_articles_adapter = TypeAdapter(list[NewsArticleOut])
+
+# Only the columns NewsArticleOut serializes, so listing news skips ORM hydration
+_article_columns = tuple(getattr(NewsArticle, name) for name in NewsArticleOut.model_fields)
+
+
+async def _store_new_articles(db: AsyncSession, fresh_articles: list[dict]) -> list[Row]:
+    """
+    Insert fetched articles that aren't stored yet, deduplicated by url_hash.
+
+    A single INSERT ... ON CONFLICT DO NOTHING skips known hashes (and repeats
+    within the batch) in the database, so there is no separate existence check
+    and no window for a concurrent refresh to slip a duplicate in between.
+
+    Returns:
+        The inserted articles' output columns via RETURNING (pending the caller's commit).
+    """
+    if not fresh_articles:
+        return []
+
+    result = await db.execute(
+        insert(NewsArticle)
+        .values(fresh_articles)
+        .on_conflict_do_nothing(index_elements=[NewsArticle.url_hash])
+        .returning(*_article_columns)
+    )
+    return list(result.all())
+
 
 @router.get("/{market_id}", response_model=NewsListResponse)
+@cached_response(
+    market_news_cache,
+    key=lambda market_id, limit, **_: (market_id, limit),
+    should_cache=lambda response: response.total > 0,
+)
 async def get_news_for_market(
     market_id: str,
     limit: int = Query(default=20, ge=1, le=100),
@@ -33,24 +70,18 @@ async def get_news_for_market(
         List of news articles for the market.
     """
     # Find the market
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
-
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
-
+    market = await _get_market_by_id_or_slug(db, market_id, Market.id, Market.slug, Market.title)
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
 
     # Get cached news articles
     result = await db.execute(
-        select(NewsArticle)
+        select(*_article_columns)
         .where(NewsArticle.market_id == market.id)
         .order_by(NewsArticle.published_at.desc())
         .limit(limit)
     )
-    articles = result.scalars().all()
+    articles = result.all()
 
     # If no cached articles, fetch fresh ones
     if not articles:
@@ -60,31 +91,18 @@ async def get_news_for_market(
             limit=limit,
         )
 
-        # Store in database
-        for article_data in fresh_articles:
-            # Check for duplicate by url_hash
-            existing = await db.execute(
-                select(NewsArticle).where(NewsArticle.url_hash == article_data["url_hash"])
-            )
-            if existing.scalar_one_or_none():
-                continue
-
-            article = NewsArticle(**article_data)
-            db.add(article)
-
+        # Store in database; RETURNING hands back the stored rows, so order
+        # them like the query above (newest first, undated last) instead of
+        # selecting them again
+        articles = await _store_new_articles(db, fresh_articles)
         await db.commit()
-
-        # Refetch from database
-        result = await db.execute(
-            select(NewsArticle)
-            .where(NewsArticle.market_id == market.id)
-            .order_by(NewsArticle.published_at.desc())
-            .limit(limit)
+        articles.sort(
+            key=lambda a: (a.published_at is not None, a.published_at), reverse=True
         )
-        articles = result.scalars().all()
+        articles = articles[:limit]
 
     return NewsListResponse(
-        articles=[NewsArticleOut.model_validate(a) for a in articles],
+        articles=_articles_adapter.validate_python(articles, from_attributes=True),
         total=len(articles),
         market_id=market.id,
     )
@@ -107,13 +125,7 @@ async def refresh_news_for_market(
         Summary of refreshed articles.
     """
     # Find the market
-    result = await db.execute(select(Market).where(Market.id == market_id))
-    market = result.scalar_one_or_none()
-
-    if not market:
-        result = await db.execute(select(Market).where(Market.slug == market_id))
-        market = result.scalar_one_or_none()
-
+    market = await _get_market_by_id_or_slug(db, market_id, Market.id, Market.slug, Market.title)
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
 
@@ -124,22 +136,14 @@ async def refresh_news_for_market(
         limit=limit,
     )
 
-    new_count = 0
-    for article_data in fresh_articles:
-        existing = await db.execute(
-            select(NewsArticle).where(NewsArticle.url_hash == article_data["url_hash"])
-        )
-        if existing.scalar_one_or_none():
-            continue
-
-        article = NewsArticle(**article_data)
-        db.add(article)
-        new_count += 1
-
+    new_articles = await _store_new_articles(db, fresh_articles)
     await db.commit()
+    if new_articles:
+        keys = {market_id, market.id, market.slug}
+        market_news_cache.discard_where(lambda key: key[0] in keys)
 
     return {
         "market_id": market.id,
         "fetched": len(fresh_articles),
-        "new_articles": new_count,
+        "new_articles": len(new_articles),
     }
@@ -6,23 +6,28 @@ Provides endpoints for fetching Polymarket user activity, PnL, and position anal
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import re
+import string
 from datetime import datetime
 from typing import Any
 
-import httpx
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+
+from src.backend.cache import user_profile_cache
+from src.backend.http_clients import data_api_http, gamma_http
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
-GAMMA_API_BASE = "https://gamma-api.polymarket.com"
-DATA_API_BASE = "https://data-api.polymarket.com"
+_HEX_DIGITS = frozenset(string.hexdigits)
 
-WALLET_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
+# Profile lookups currently running, so concurrent requests share one
+_profile_lookups: dict[str, asyncio.Task] = {}
 
 
 class UserProfile(BaseModel):
@@ -49,6 +54,12 @@ class UserPosition(BaseModel):
     last_updated: str | None = None
     is_open: bool = True
 
+    # Parsed last_updated, kept so metrics don't re-parse the ISO string. A
+    # plain excluded field rather than a private attribute, which reads slowly.
+    updated_at: datetime | None = Field(default=None, exclude=True)
+    # Outcome bucket for metrics, classified once (see _OUTCOME_CODES)
+    outcome_code: int = Field(default=2, exclude=True)
+
 
 class UserMetrics(BaseModel):
     total_pnl: float = 0.0
@@ -108,7 +119,30 @@ def _parse_datetime(value: Any) -> datetime | None:
 
 
 def _is_wallet_address(identifier: str) -> bool:
-    return bool(WALLET_RE.match(identifier))
+    # "0x" followed by exactly 40 hex digits
+    return (
+        len(identifier) == 42
+        and identifier.startswith("0x")
+        and _HEX_DIGITS.issuperset(identifier[2:])
+    )
+
+
+def _first(data: dict, keys: tuple[str, ...]) -> Any:
+    """Evaluate `data.get(k1) or data.get(k2) or ...` over `keys`."""
+    get = data.get
+    value = None
+    for key in keys:
+        value = get(key)
+        if value:
+            break
+    return value
+
+
+# Gamma profile field aliases, in lookup order
+_USERNAME_KEYS = ("username", "name", "pseudonym", "profileUsername", "handle")
+_ADDRESS_KEYS = ("address", "walletAddress", "wallet_address", "proxyWallet", "wallet", "id")
+_DISPLAY_NAME_KEYS = ("displayName", "name")
+_PROFILE_IMAGE_KEYS = ("profileImage", "avatar", "image", "picture")
 
 
 def _extract_user_from_candidate(candidate: dict, requested_username: str | None) -> UserProfile | None:
@@ -119,21 +153,8 @@ def _extract_user_from_candidate(candidate: dict, requested_username: str | None
     if isinstance(candidate.get("user"), dict):
         candidate = candidate.get("user")
 
-    username = (
-        candidate.get("username")
-        or candidate.get("name")
-        or candidate.get("pseudonym")
-        or candidate.get("profileUsername")
-        or candidate.get("handle")
-    )
-    address = (
-        candidate.get("address")
-        or candidate.get("walletAddress")
-        or candidate.get("wallet_address")
-        or candidate.get("proxyWallet")
-        or candidate.get("wallet")
-        or candidate.get("id")
-    )
+    username = _first(candidate, _USERNAME_KEYS)
+    address = _first(candidate, _ADDRESS_KEYS)
     if not address:
         return None
 
@@ -142,13 +163,8 @@ def _extract_user_from_candidate(candidate: dict, requested_username: str | None
             # Keep it, but mark as not strictly resolved by username match
             pass
 
-    display_name = candidate.get("displayName") or candidate.get("name") or username
-    profile_image = (
-        candidate.get("profileImage")
-        or candidate.get("avatar")
-        or candidate.get("image")
-        or candidate.get("picture")
-    )
+    display_name = _first(candidate, _DISPLAY_NAME_KEYS) or username
+    profile_image = _first(candidate, _PROFILE_IMAGE_KEYS)
 
     return UserProfile(
         address=str(address),
@@ -160,125 +176,141 @@ def _extract_user_from_candidate(candidate: dict, requested_username: str | None
 
 
 async def _resolve_user(identifier: str) -> UserProfile | None:
+    """Resolve a username or wallet to a profile, cached for a few minutes."""
+    profile = user_profile_cache.get(identifier)
+    if profile is not None:
+        return profile
+
+    task = _profile_lookups.get(identifier)
+    if task is None:
+        task = asyncio.create_task(_lookup_user(identifier))
+        _profile_lookups[identifier] = task
+        task.add_done_callback(lambda _: _profile_lookups.pop(identifier, None))
+
+    profile = await asyncio.shield(task)
+    if profile is not None:
+        user_profile_cache.set(identifier, profile)
+    return profile
+
+
+async def _lookup_user(identifier: str) -> UserProfile | None:
     if _is_wallet_address(identifier):
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                response = await client.get(
-                    f"{GAMMA_API_BASE}/public-profile", params={"address": identifier}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    profile = _extract_user_from_candidate(data, None)
-                    if profile:
-                        return profile
-            except Exception as e:
-                logger.debug(f"Failed to fetch public profile for wallet: {e}")
+        client = gamma_http.get()
+        try:
+            response = await client.get("/public-profile", params={"address": identifier})
+            if response.status_code == 200:
+                data = response.json()
+                profile = _extract_user_from_candidate(data, None)
+                if profile:
+                    return profile
+        except Exception as e:
+            logger.debug(f"Failed to fetch public profile for wallet: {e}")
         return UserProfile(address=identifier, resolved=True)
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    client = gamma_http.get()
+
+    async def via_public_profile() -> UserProfile | None:
         # Some older accounts resolve only via public-profile
         try:
-            response = await client.get(
-                f"{GAMMA_API_BASE}/public-profile", params={"username": identifier}
-            )
+            response = await client.get("/public-profile", params={"username": identifier})
             if response.status_code == 200:
                 data = response.json()
-                profile = _extract_user_from_candidate(data, identifier)
-                if profile:
-                    return profile
+                return _extract_user_from_candidate(data, identifier)
         except Exception as e:
             logger.debug(f"Failed to resolve user via public-profile: {e}")
+        return None
 
-        for params in (
-            {"q": identifier, "search_profiles": "true", "limit_per_type": 10},
-            {"q": identifier},
-        ):
-            try:
-                response = await client.get(f"{GAMMA_API_BASE}/public-search", params=params)
-                if response.status_code != 200:
-                    continue
-                data = response.json()
+    async def via_public_search(params: dict) -> UserProfile | None:
+        try:
+            response = await client.get("/public-search", params=params)
+            if response.status_code != 200:
+                return None
+            data = response.json()
 
-                candidates: list[dict] = []
-                if isinstance(data, dict):
-                    for key in ("profiles", "users", "results", "data", "items"):
-                        if isinstance(data.get(key), list):
-                            candidates = data.get(key, [])
-                            break
+            candidates: list[dict] = []
+            if isinstance(data, dict):
+                for key in ("profiles", "users", "results", "data", "items"):
+                    if isinstance(data.get(key), list):
+                        candidates = data.get(key, [])
+                        break
 
-                if not candidates:
-                    continue
+            if not candidates:
+                return None
 
-                # Prefer exact username match if possible
-                exact_match = None
-                for candidate in candidates:
-                    username = (
-                        candidate.get("username")
-                        or candidate.get("name")
-                        or candidate.get("pseudonym")
-                        or candidate.get("profileUsername")
-                    )
-                    if username and str(username).lower() == identifier.lower():
-                        exact_match = candidate
-                        break
+            # Prefer exact username match if possible
+            exact_match = None
+            requested = identifier.lower()
+            for candidate in candidates:
+                username = _first(candidate, _USERNAME_KEYS)
+                if username and str(username).lower() == requested:
+                    exact_match = candidate
+                    break
 
-                selected = exact_match or candidates[0]
-                profile = _extract_user_from_candidate(selected, identifier)
-                if profile:
-                    return profile
-            except Exception as e:
-                logger.debug(f"Failed to resolve user with params {params}: {e}")
-                continue
+            selected = exact_match or candidates[0]
+            return _extract_user_from_candidate(selected, identifier)
+        except Exception as e:
+            logger.debug(f"Failed to resolve user with params {params}: {e}")
+            return None
+
+    # All lookups run concurrently; the first hit in priority order wins
+    results = await asyncio.gather(
+        via_public_profile(),
+        via_public_search({"q": identifier, "search_profiles": "true", "limit_per_type": 10}),
+        via_public_search({"q": identifier}),
+    )
+    for profile in results:
+        if profile:
+            return profile
 
     return None
 
 
 async def _fetch_positions(user_identifier: str, limit: int) -> list[dict]:
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            response = await client.get(
-                f"{DATA_API_BASE}/positions",
-                params={"user": user_identifier, "limit": str(limit)},
-            )
-            if response.status_code != 200:
-                logger.warning(f"Positions API status {response.status_code}: {response.text}")
-                return []
-            data = response.json()
-            if isinstance(data, dict):
-                for key in ("positions", "results", "data", "items"):
-                    if isinstance(data.get(key), list):
-                        return data.get(key, [])
-                return []
-            if isinstance(data, list):
-                return data
+    client = data_api_http.get()
+    try:
+        response = await client.get(
+            "/positions",
+            params={"user": user_identifier, "limit": str(limit)},
+        )
+        if response.status_code != 200:
+            logger.warning(f"Positions API status {response.status_code}: {response.text}")
             return []
-        except Exception as e:
-            logger.error(f"Failed to fetch positions: {e}")
+        data = response.json()
+        if isinstance(data, dict):
+            for key in ("positions", "results", "data", "items"):
+                if isinstance(data.get(key), list):
+                    return data.get(key, [])
             return []
+        if isinstance(data, list):
+            return data
+        return []
+    except Exception as e:
+        logger.error(f"Failed to fetch positions: {e}")
+        return []
 
 
 async def _fetch_closed_positions(user_identifier: str, limit: int) -> list[dict]:
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            response = await client.get(
-                f"{DATA_API_BASE}/closed-positions",
-                params={"user": user_identifier, "limit": str(limit)},
-            )
-            if response.status_code != 200:
-                logger.warning(f"Closed positions API status {response.status_code}: {response.text}")
-                return []
-            data = response.json()
-            if isinstance(data, dict):
-                for key in ("positions", "results", "data", "items"):
-                    if isinstance(data.get(key), list):
-                        return data.get(key, [])
-                return []
-            if isinstance(data, list):
-                return data
+    client = data_api_http.get()
+    try:
+        response = await client.get(
+            "/closed-positions",
+            params={"user": user_identifier, "limit": str(limit)},
+        )
+        if response.status_code != 200:
+            logger.warning(f"Closed positions API status {response.status_code}: {response.text}")
             return []
-        except Exception as e:
-            logger.error(f"Failed to fetch closed positions: {e}")
+        data = response.json()
+        if isinstance(data, dict):
+            for key in ("positions", "results", "data", "items"):
+                if isinstance(data.get(key), list):
+                    return data.get(key, [])
             return []
+        if isinstance(data, list):
+            return data
+        return []
+    except Exception as e:
+        logger.error(f"Failed to fetch closed positions: {e}")
+        return []
 
 
 def _extract_list_from_response(data: object) -> list[dict]:
@@ -311,135 +343,142 @@ def _position_key_from_raw(item: dict) -> str | None:
     return f"{market_id}:{outcome}"
 
 
+async def _fetch_positions_page(endpoint: str, params: dict) -> object | None:
+    """Fetch one Data API page; None when the request fails or is rejected."""
+    try:
+        response = await data_api_http.get().get(f"/{endpoint}", params=params, timeout=20.0)
+        if response.status_code != 200:
+            logger.warning(f"{endpoint} API status {response.status_code}: {response.text}")
+            return None
+        return response.json()
+    except Exception as e:
+        logger.error(f"Failed to fetch {endpoint} page: {e}")
+        return None
+
+
 async def _fetch_all_positions(
     endpoint: str,
     user_identifier: str,
     limit: int,
     max_pages: int = 200,
+    prefetch: int = 4,
 ) -> list[dict]:
     """
     Best-effort pagination for Data API. Tries cursor if present; otherwise uses offset.
     Stops when an empty page is returned or page limit is reached.
+
+    Cursor pages are opaque and fetched one at a time. Offset pages are fetched
+    `prefetch` at a time, striding by the size of the first page (the API may
+    cap `limit`), and consumed in order until one comes back empty.
     """
     collected: list[dict] = []
     seen_ids: set[str] = set()
     cursor: str | None = None
     offset = 0
     page = 0
+    stride: int | None = None
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        while page < max_pages:
-            params = {"user": user_identifier, "limit": str(limit)}
-            if cursor:
-                params["cursor"] = cursor
-            else:
-                params["offset"] = str(offset)
-
-            try:
-                response = await client.get(f"{DATA_API_BASE}/{endpoint}", params=params)
-                if response.status_code != 200:
-                    logger.warning(f"{endpoint} API status {response.status_code}: {response.text}")
-                    break
-                data = response.json()
-                batch = _extract_list_from_response(data)
-                if not batch:
-                    break
+    def page_params(**extra: str) -> dict:
+        return {"user": user_identifier, "limit": str(limit), **extra}
 
-                new_items = 0
-                for item in batch:
-                    if not isinstance(item, dict):
-                        continue
-                    key = _position_key_from_raw(item)
-                    if key and key in seen_ids:
-                        continue
-                    if key:
-                        seen_ids.add(key)
-                    collected.append(item)
-                    new_items += 1
-
-                if new_items == 0:
-                    break
+    while page < max_pages:
+        if cursor:
+            pages = [await _fetch_positions_page(endpoint, page_params(cursor=cursor))]
+        elif stride is None:
+            pages = [await _fetch_positions_page(endpoint, page_params(offset=str(offset)))]
+        else:
+            pages = await asyncio.gather(
+                *(
+                    _fetch_positions_page(endpoint, page_params(offset=str(offset + i * stride)))
+                    for i in range(min(prefetch, max_pages - page))
+                )
+            )
 
-                next_cursor = _extract_next_cursor(data)
-                if next_cursor and next_cursor != cursor:
-                    cursor = next_cursor
-                else:
-                    cursor = None
-                    offset += len(batch)
+        done = False
+        for data in pages:
+            batch = _extract_list_from_response(data) if data is not None else []
+            if not batch:
+                done = True
+                break
 
-                page += 1
-            except Exception as e:
-                logger.error(f"Failed to fetch {endpoint} page: {e}")
+            new_items = 0
+            for item in batch:
+                if not isinstance(item, dict):
+                    continue
+                key = _position_key_from_raw(item)
+                if key and key in seen_ids:
+                    continue
+                if key:
+                    seen_ids.add(key)
+                collected.append(item)
+                new_items += 1
+
+            if new_items == 0:
+                done = True
+                break
+
+            page += 1
+            next_cursor = _extract_next_cursor(data)
+            if next_cursor and next_cursor != cursor:
+                # Switch to cursor paging; any prefetched offset pages are dropped
+                cursor = next_cursor
                 break
+            cursor = None
+            offset += len(batch)
+            if stride is None:
+                stride = len(batch)
+
+        if done:
+            break
 
     return collected
 
 
+# Data API field aliases for each position attribute, in lookup order
+_MARKET_ID_KEYS = ("conditionId", "condition_id", "marketId", "market_id", "id")
+_TITLE_KEYS = ("title", "question", "marketTitle", "market")
+_SLUG_KEYS = ("slug", "marketSlug", "market_slug")
+_OUTCOME_KEYS = ("outcome", "side", "positionSide")
+_SHARES_KEYS = ("size", "shares", "amount")
+_AVG_PRICE_KEYS = ("avgPrice", "avg_price", "averagePrice")
+_CURRENT_VALUE_KEYS = ("currentValue", "current_value")
+_INITIAL_VALUE_KEYS = ("initialValue", "initial_value", "costBasis")
+_TOTAL_BOUGHT_KEYS = ("totalBought", "total_bought")
+_CASH_PNL_KEYS = ("cashPnl", "cash_pnl", "realizedPnl", "realized_pnl")
+_PERCENT_PNL_KEYS = ("percentPnl", "percent_pnl")
+_STATUS_KEYS = ("status", "state", "positionStatus", "marketStatus")
+_LAST_UPDATED_KEYS = ("updatedAt", "lastUpdated", "timestamp", "createdAt")
+
+# Outcome buckets for metrics: 0 = yes-like, 1 = no-like, anything else 2
+_OUTCOME_CODES = {"yes": 0, "up": 0, "no": 1, "down": 1}
+
+
 def _normalize_position(position: dict, force_is_open: bool | None = None) -> UserPosition | None:
     if not isinstance(position, dict):
         return None
 
-    market_id = (
-        position.get("conditionId")
-        or position.get("condition_id")
-        or position.get("marketId")
-        or position.get("market_id")
-        or position.get("id")
-    )
-    title = (
-        position.get("title")
-        or position.get("question")
-        or position.get("marketTitle")
-        or position.get("market")
-    )
-    slug = position.get("slug") or position.get("marketSlug") or position.get("market_slug")
-    outcome = position.get("outcome") or position.get("side") or position.get("positionSide")
+    market_id = _first(position, _MARKET_ID_KEYS)
+    title = _first(position, _TITLE_KEYS)
+    slug = _first(position, _SLUG_KEYS)
+    outcome = _first(position, _OUTCOME_KEYS)
 
-    shares = _safe_float(
-        position.get("size")
-        or position.get("shares")
-        or position.get("amount")
-    )
-    avg_price = _safe_float(
-        position.get("avgPrice")
-        or position.get("avg_price")
-        or position.get("averagePrice")
-    )
-    current_value = _safe_float(position.get("currentValue") or position.get("current_value"))
-    initial_value = _safe_float(
-        position.get("initialValue")
-        or position.get("initial_value")
-        or position.get("costBasis")
-    )
-    total_bought = _safe_float(position.get("totalBought") or position.get("total_bought"))
+    shares = _safe_float(_first(position, _SHARES_KEYS))
+    avg_price = _safe_float(_first(position, _AVG_PRICE_KEYS))
+    current_value = _safe_float(_first(position, _CURRENT_VALUE_KEYS))
+    initial_value = _safe_float(_first(position, _INITIAL_VALUE_KEYS))
+    total_bought = _safe_float(_first(position, _TOTAL_BOUGHT_KEYS))
     if initial_value == 0:
         initial_value = total_bought
-    cash_pnl = _safe_float(
-        position.get("cashPnl")
-        or position.get("cash_pnl")
-        or position.get("realizedPnl")
-        or position.get("realized_pnl")
-    )
-    percent_pnl = _safe_float(position.get("percentPnl") or position.get("percent_pnl"))
+    cash_pnl = _safe_float(_first(position, _CASH_PNL_KEYS))
+    percent_pnl = _safe_float(_first(position, _PERCENT_PNL_KEYS))
     if percent_pnl == 0 and cash_pnl != 0:
         if total_bought > 0:
             percent_pnl = (cash_pnl / total_bought) * 100
         elif initial_value > 0:
             percent_pnl = (cash_pnl / initial_value) * 100
 
-    status = (
-        position.get("status")
-        or position.get("state")
-        or position.get("positionStatus")
-        or position.get("marketStatus")
-    )
-
-    last_updated = (
-        position.get("updatedAt")
-        or position.get("lastUpdated")
-        or position.get("timestamp")
-        or position.get("createdAt")
-    )
+    status = _first(position, _STATUS_KEYS)
+    last_updated = _first(position, _LAST_UPDATED_KEYS)
 
     status_value = str(status).lower() if status else ""
     is_open = None
@@ -458,12 +497,14 @@ def _normalize_position(position: dict, force_is_open: bool | None = None) -> Us
         is_open = force_is_open
 
     parsed_dt = _parse_datetime(last_updated)
+    outcome = str(outcome) if outcome else None
 
     return UserPosition(
         market_id=str(market_id) if market_id else None,
         title=str(title) if title else None,
         slug=str(slug) if slug else None,
-        outcome=str(outcome) if outcome else None,
+        outcome=outcome,
+        outcome_code=_OUTCOME_CODES.get(outcome.lower(), 2) if outcome else 2,
         shares=shares,
         avg_price=avg_price,
         current_value=current_value,
@@ -473,6 +514,7 @@ def _normalize_position(position: dict, force_is_open: bool | None = None) -> Us
         percent_pnl=percent_pnl,
         status=str(status) if status else None,
         last_updated=parsed_dt.isoformat() if parsed_dt else None,
+        updated_at=parsed_dt,
         is_open=bool(is_open),
     )
 
@@ -487,54 +529,46 @@ def _position_key(position: UserPosition) -> str | None:
 
 def _compute_metrics(open_positions: list[UserPosition], closed_positions: list[UserPosition]) -> UserMetrics:
     positions = [*open_positions, *closed_positions]
-    if not positions:
+    position_count = len(positions)
+    if not position_count:
         return UserMetrics()
+    n_open = len(open_positions)
+
+    # Struct-of-arrays view built in one pass; open positions come first, so
+    # open/closed splits are slices and every metric is a vectorized reduction
+    fields = np.array(
+        [
+            (p.cash_pnl, p.total_bought, p.initial_value, p.current_value, p.percent_pnl)
+            for p in positions
+        ],
+        dtype=np.float64,
+    )
+    cash_pnl, total_bought, initial_value, current_value, percent_pnl = fields.T
+    cost = np.where(total_bought > 0, total_bought, initial_value)
 
-    unrealized_pnl = sum(p.cash_pnl for p in open_positions)
-    realized_pnl = sum(p.cash_pnl for p in closed_positions)
-
-    def position_cost(p: UserPosition) -> float:
-        return p.total_bought if p.total_bought > 0 else p.initial_value
-
-    realized_cost_basis = sum(position_cost(p) for p in closed_positions)
-    volume_traded = sum(position_cost(p) for p in positions)
+    unrealized_pnl = float(cash_pnl[:n_open].sum())
+    realized_pnl = float(cash_pnl[n_open:].sum())
+    realized_cost_basis = float(cost[n_open:].sum())
+    volume_traded = float(cost.sum())
     total_initial_value = volume_traded
-    total_current_value = sum(p.current_value for p in open_positions)
+    total_current_value = float(current_value[:n_open].sum())
     total_pnl = unrealized_pnl + realized_pnl
 
-    win_positions = [p for p in positions if p.cash_pnl > 0]
-
     total_roi = (total_pnl / volume_traded * 100) if volume_traded > 0 else 0.0
     realized_roi = (realized_pnl / realized_cost_basis * 100) if realized_cost_basis > 0 else 0.0
-    avg_roi = sum(p.percent_pnl for p in positions) / len(positions) if positions else 0.0
-    avg_position_size = total_initial_value / len(positions) if positions else 0.0
-    largest_position_value = max((p.current_value for p in positions), default=0.0)
-
-    best_position = max(positions, key=lambda p: p.cash_pnl, default=None)
-    worst_position = min(positions, key=lambda p: p.cash_pnl, default=None)
-
-    yes_positions = 0
-    no_positions = 0
-    other_positions = 0
-    for p in positions:
-        if not p.outcome:
-            other_positions += 1
-            continue
-        outcome = p.outcome.lower()
-        if outcome in {"yes", "up"}:
-            yes_positions += 1
-        elif outcome in {"no", "down"}:
-            no_positions += 1
-        else:
-            other_positions += 1
-
-    last_activity = None
-    for p in positions:
-        dt = _parse_datetime(p.last_updated)
-        if dt and (last_activity is None or dt > last_activity):
-            last_activity = dt
+    avg_roi = float(percent_pnl.mean())
+    avg_position_size = total_initial_value / position_count
+    largest_position_value = float(current_value.max())
+    best_pnl = float(cash_pnl.max())
+    worst_pnl = float(cash_pnl.min())
+    win_rate = float((cash_pnl > 0).mean() * 100)
+
+    outcome_codes = np.fromiter(
+        (p.outcome_code for p in positions), dtype=np.intp, count=position_count
+    )
+    yes_positions, no_positions, other_positions = np.bincount(outcome_codes, minlength=3).tolist()
 
-    win_rate = (len(win_positions) / len(positions) * 100) if positions else 0.0
+    last_activity = max((p.updated_at for p in positions if p.updated_at), default=None)
 
     return UserMetrics(
         total_pnl=round(total_pnl, 2),
@@ -552,8 +586,8 @@ def _compute_metrics(open_positions: list[UserPosition], closed_positions: list[
         avg_roi=round(avg_roi, 2),
         avg_position_size=round(avg_position_size, 2),
         largest_position_value=round(largest_position_value, 2),
-        best_position_pnl=round(best_position.cash_pnl, 2) if best_position else 0.0,
-        worst_position_pnl=round(worst_position.cash_pnl, 2) if worst_position else 0.0,
+        best_position_pnl=round(best_pnl, 2),
+        worst_position_pnl=round(worst_pnl, 2),
         yes_positions=yes_positions,
         no_positions=no_positions,
         other_positions=other_positions,
@@ -561,34 +595,19 @@ def _compute_metrics(open_positions: list[UserPosition], closed_positions: list[
     )
 
 
-@router.get("/analytics", response_model=UserAnalyticsResponse)
-async def get_user_analytics(
-    query: str = Query(..., min_length=2),
-    limit: int = Query(500, ge=1, le=2000),
-    list_limit: int = Query(50, ge=1, le=200),
-) -> UserAnalyticsResponse:
+def _analyze_positions(
+    positions_raw: list[dict], closed_positions_raw: list[dict]
+) -> tuple[
+    list[UserPosition], list[UserPosition], UserMetrics, list[UserPosition], list[UserPosition]
+]:
     """
-    Analyze a Polymarket user by username or wallet address.
+    Normalize raw positions and derive the analytics from them.
 
-    Returns user metrics, open/closed positions, and top wins/losses.
+    Returns:
+        (open positions, closed positions, metrics, biggest wins, biggest losses).
     """
-    identifier = query.strip()
-    if not identifier:
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
-
-    profile = await _resolve_user(identifier)
-
-    # If we couldn't resolve a username, try using the identifier directly
-    user_identifier = profile.address if profile else identifier
-
-    positions_raw = await _fetch_all_positions("positions", user_identifier, limit)
-    closed_positions_raw = await _fetch_all_positions("closed-positions", user_identifier, limit)
-
-    if not positions_raw and not closed_positions_raw and not profile:
-        raise HTTPException(status_code=404, detail="User not found")
-
     open_positions_raw: list[UserPosition] = []
-    closed_positions_raw_norm: list[UserPosition] = []
+    closed_positions: list[UserPosition] = []
 
     for pos in positions_raw:
         normalized = _normalize_position(pos, force_is_open=True)
@@ -597,11 +616,10 @@ async def get_user_analytics(
     for pos in closed_positions_raw:
         normalized = _normalize_position(pos, force_is_open=False)
         if normalized:
-            closed_positions_raw_norm.append(normalized)
+            closed_positions.append(normalized)
 
-    closed_keys = {k for p in closed_positions_raw_norm if (k := _position_key(p))}
+    closed_keys = {k for p in closed_positions if (k := _position_key(p))}
     open_positions = [p for p in open_positions_raw if _position_key(p) not in closed_keys]
-    closed_positions = closed_positions_raw_norm
 
     metrics = _compute_metrics(open_positions, closed_positions)
 
@@ -617,15 +635,61 @@ async def get_user_analytics(
         key=lambda p: p.cash_pnl,
     )
 
+    return open_positions, closed_positions, metrics, biggest_wins, biggest_losses
+
+
+@router.get(
+    "/analytics", response_model=UserAnalyticsResponse, response_class=ORJSONResponse
+)
+async def get_user_analytics(
+    query: str = Query(..., min_length=2),
+    limit: int = Query(500, ge=1, le=2000),
+    list_limit: int = Query(50, ge=1, le=200),
+    max_pages: int = Query(200, ge=1, le=200),
+) -> UserAnalyticsResponse:
+    """
+    Analyze a Polymarket user by username or wallet address.
+
+    Returns user metrics, open/closed positions, and top wins/losses.
+    `limit` is the Data API page size and `max_pages` caps how many pages of
+    open and closed positions are fetched; metrics cover everything fetched.
+    """
+    identifier = query.strip()
+    if not identifier:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
+    profile = await _resolve_user(identifier)
+
+    # If we couldn't resolve a username, try using the identifier directly
+    user_identifier = profile.address if profile else identifier
+
+    # Open and closed positions are independent, so page through both at once
+    positions_raw, closed_positions_raw = await asyncio.gather(
+        _fetch_all_positions("positions", user_identifier, limit, max_pages=max_pages),
+        _fetch_all_positions("closed-positions", user_identifier, limit, max_pages=max_pages),
+    )
+
+    if not positions_raw and not closed_positions_raw and not profile:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Normalizing and scoring thousands of positions is pure CPU work, so it
+    # runs in a worker thread to keep the event loop serving other requests
+    open_positions, closed_positions, metrics, biggest_wins, biggest_losses = (
+        await asyncio.to_thread(_analyze_positions, positions_raw, closed_positions_raw)
+    )
+
     if not profile:
         profile = UserProfile(address=user_identifier, resolved=False)
 
-    return UserAnalyticsResponse(
+    response = UserAnalyticsResponse(
         user=profile,
         metrics=metrics,
         open_positions=open_positions[:list_limit],
         closed_positions=closed_positions[:list_limit],
         biggest_wins=biggest_wins[: min(10, list_limit)],
         biggest_losses=biggest_losses[: min(10, list_limit)],
-        positions_total=len(normalized_positions),
+        positions_total=len(open_positions) + len(closed_positions),
     )
+    # Every field is already validated, so hand orjson the plain dump directly
+    # rather than letting FastAPI re-validate and JSON-encode it field by field
+    return ORJSONResponse(response.model_dump())
@@ -4,18 +4,42 @@ Background tasks for updating market data.
 Uses APScheduler to run periodic updates.
 """
 
+import hashlib
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-from sqlalchemy import select, delete
+import orjson
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.database import async_session_factory
+from src.backend.cache import market_slug_ids, market_snapshot_cache, top_markets_cache
+from src.backend.database import async_session_factory, engine
 from src.backend.models import AppState, Market, PriceHistory
 from src.backend.polymarket.client import polymarket_client
 
 logger = logging.getLogger(__name__)
 
+# Columns a market upsert may write; created_at keeps the value from first insert
+_MARKET_COLUMNS = frozenset(Market.__table__.columns.keys()) - {"created_at"}
+
+# Price points are bound per tick, so one statement serves every executemany
+_PRICE_HISTORY_INSERT = insert(PriceHistory.__table__)
+
+# Digest of the last market snapshot written, to skip rewriting identical ticks
+_last_snapshot_hash: bytes | None = None
+
+
+@lru_cache(maxsize=8)
+def _market_upsert(fields: frozenset[str]):
+    """Build the market upsert for a field set once; each tick binds fresh rows."""
+    stmt = insert(Market.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[Market.id],
+        set_={key: stmt.excluded[key] for key in fields if key != "id"},
+    )
+
 
 async def update_top_markets() -> None:
     """
@@ -23,6 +47,7 @@ async def update_top_markets() -> None:
 
     Fetches fresh data from Polymarket API and updates the database.
     """
+    global _last_snapshot_hash
     logger.info("Starting market update task...")
 
     try:
@@ -33,53 +58,58 @@ async def update_top_markets() -> None:
             logger.warning("No markets fetched from Polymarket API")
             return
 
+        snapshot_hash = hashlib.blake2b(orjson.dumps(markets_data), digest_size=16).digest()
+        markets_changed = snapshot_hash != _last_snapshot_hash
+
         async with async_session_factory() as db:
             now = datetime.utcnow()
 
-            # Update or create each market
-            for market_data in markets_data:
-                # Check if market exists
-                result = await db.execute(
-                    select(Market).where(Market.id == market_data["id"])
-                )
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    # Update existing market
-                    for key, value in market_data.items():
-                        if hasattr(existing, key):
-                            setattr(existing, key, value)
-                    existing.last_updated = now
-                else:
-                    # Create new market
-                    market = Market(**market_data)
-                    db.add(market)
-
-                # Record price history for this market
-                price_point = PriceHistory(
-                    market_id=market_data["id"],
-                    yes_percentage=market_data.get("yes_percentage", 50.0),
-                    volume=market_data.get("volume_24h", 0.0),
-                    timestamp=now,
+            # Upsert every market in one executemany, ignoring fields Market doesn't
+            # store; an identical snapshot only refreshes the rows' last_updated
+            if markets_changed:
+                fields = _MARKET_COLUMNS.intersection(markets_data[0])
+                market_rows = [
+                    {key: market_data[key] for key in fields} | {"last_updated": now}
+                    for market_data in markets_data
+                ]
+                await db.execute(_market_upsert(fields | {"last_updated"}), market_rows)
+            else:
+                await db.execute(
+                    update(Market)
+                    .where(Market.id.in_([market_data["id"] for market_data in markets_data]))
+                    .values(last_updated=now)
                 )
-                db.add(price_point)
 
-            # Update last update timestamp
-            state_result = await db.execute(
-                select(AppState).where(AppState.key == "markets_last_updated")
+            # Record price history for every market in one Core executemany;
+            # these rows are write-only, so they skip the ORM bulk-insert path.
+            # The database stamps each point through the column's server default.
+            await db.execute(
+                _PRICE_HISTORY_INSERT,
+                [
+                    {
+                        "market_id": market_data["id"],
+                        "yes_percentage": market_data.get("yes_percentage", 50.0),
+                        "volume": market_data.get("volume_24h", 0.0),
+                    }
+                    for market_data in markets_data
+                ],
             )
-            state = state_result.scalar_one_or_none()
 
-            if state:
-                state.value = now.isoformat()
-            else:
-                state = AppState(
-                    key="markets_last_updated",
-                    value=now.isoformat(),
+            # Update last update timestamp
+            stmt = insert(AppState).values(key="markets_last_updated", value=now.isoformat())
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[AppState.key],
+                    set_={"value": stmt.excluded.value, "updated_at": func.now()},
                 )
-                db.add(state)
+            )
 
             await db.commit()
+            _last_snapshot_hash = snapshot_hash
+            market_snapshot_cache.clear()
+            top_markets_cache.clear()
+            if markets_changed:
+                await refresh_market_slug_ids(db)
             logger.info(f"Successfully updated {len(markets_data)} markets with price history")
 
     except Exception as e:
@@ -87,12 +117,63 @@ async def update_top_markets() -> None:
         raise
 
 
-async def cleanup_old_news(days: int = 7) -> None:
+async def refresh_market_slug_ids(db: AsyncSession | None = None) -> None:
+    """
+    Rebuild the in-memory slug -> ID map of active markets.
+
+    Args:
+        db: Session to read with; a short-lived one is opened when omitted.
+    """
+    if db is None:
+        async with async_session_factory() as session:
+            await refresh_market_slug_ids(session)
+        return
+
+    result = await db.execute(
+        select(Market.slug, Market.id).where(Market.is_active == True)  # noqa: E712
+    )
+    slug_ids = dict(result.all())
+    # Swapped in without an await in between, so readers never see a partial map
+    market_slug_ids.clear()
+    market_slug_ids.update(slug_ids)
+    logger.debug(f"Indexed {len(slug_ids)} market slugs")
+
+
+async def _delete_in_batches(model, condition, batch_size: int = 10_000) -> int:
+    """
+    Delete the rows of `model` matching `condition`, committing every batch.
+
+    SQLite allows one writer at a time, so a single huge DELETE would hold the
+    write lock (and stall the market updates) until it finished; short batches
+    let other writers in between.
+
+    Returns:
+        Total number of rows deleted.
+    """
+    deleted = 0
+    # Plain Core statements, so a bare connection will do; no ORM session needed
+    async with engine.connect() as conn:
+        while True:
+            result = await conn.execute(
+                delete(model).where(
+                    model.id.in_(select(model.id).where(condition).limit(batch_size))
+                )
+            )
+            await conn.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+async def cleanup_old_news(days: int = 7) -> bool:
     """
     Remove news articles older than the specified number of days.
 
     Args:
         days: Number of days to keep articles.
+
+    Returns:
+        True if the cleanup completed, False if it failed.
     """
     from src.backend.models import NewsArticle
 
@@ -101,38 +182,73 @@ async def cleanup_old_news(days: int = 7) -> None:
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
 
-        async with async_session_factory() as db:
-            result = await db.execute(
-                delete(NewsArticle).where(NewsArticle.created_at < cutoff)
-            )
-            await db.commit()
-            logger.info(f"Deleted {result.rowcount} old news articles")
+        deleted = await _delete_in_batches(NewsArticle, NewsArticle.created_at < cutoff)
+        logger.info(f"Deleted {deleted} old news articles")
+        return True
 
     except Exception as e:
         logger.error(f"Error cleaning up old news: {e}")
+        return False
 
 
-async def cleanup_old_price_history(days: int = 30) -> None:
+async def cleanup_old_price_history(days: int = 30) -> bool:
     """
     Remove price history older than the specified number of days.
 
     Args:
         days: Number of days to keep price history.
+
+    Returns:
+        True if the cleanup completed, False if it failed.
     """
     logger.info(f"Cleaning up price history older than {days} days...")
 
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
 
-        async with async_session_factory() as db:
-            result = await db.execute(
-                delete(PriceHistory).where(PriceHistory.timestamp < cutoff)
-            )
-            await db.commit()
-            logger.info(f"Deleted {result.rowcount} old price history records")
+        deleted = await _delete_in_batches(PriceHistory, PriceHistory.timestamp < cutoff)
+        logger.info(f"Deleted {deleted} old price history records")
+        return True
 
     except Exception as e:
         logger.error(f"Error cleaning up price history: {e}")
+        return False
+
+
+async def run_daily_maintenance(price_history_every_days: int = 7) -> None:
+    """
+    Clean up old news, and old price history when its cleanup is due.
+
+    The last price history cleanup is recorded in AppState, so the weekly
+    cadence survives restarts instead of restarting a week-long timer.
+
+    Args:
+        price_history_every_days: Minimum days between price history cleanups.
+    """
+    await cleanup_old_news()
+
+    now = datetime.utcnow()
+    async with async_session_factory() as db:
+        last_cleanup = await db.scalar(
+            select(AppState.value).where(AppState.key == "price_history_cleaned_at")
+        )
+    interval = timedelta(days=price_history_every_days)
+    if last_cleanup and now - datetime.fromisoformat(last_cleanup) < interval:
+        return
+
+    # Only a completed cleanup is recorded, so a failed one is retried next run
+    if not await cleanup_old_price_history():
+        return
+
+    async with async_session_factory() as db:
+        stmt = insert(AppState).values(key="price_history_cleaned_at", value=now.isoformat())
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AppState.key],
+                set_={"value": stmt.excluded.value, "updated_at": func.now()},
+            )
+        )
+        await db.commit()
 
 
 def get_scheduler():
@@ -143,9 +259,14 @@ def get_scheduler():
         Configured AsyncIOScheduler.
     """
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
     from apscheduler.triggers.interval import IntervalTrigger
 
-    scheduler = AsyncIOScheduler()
+    # A run that overruns its interval must not stack up a second instance;
+    # ticks missed meanwhile collapse into one catch-up run within 5 minutes
+    scheduler = AsyncIOScheduler(
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 300}
+    )
 
     # Update markets every 15 minutes (and record price history)
     scheduler.add_job(
@@ -156,21 +277,12 @@ def get_scheduler():
         replace_existing=True,
     )
 
-    # Clean up old news daily
-    scheduler.add_job(
-        cleanup_old_news,
-        trigger=IntervalTrigger(hours=24),
-        id="cleanup_news",
-        name="Clean up old news articles",
-        replace_existing=True,
-    )
-
-    # Clean up old price history weekly
+    # Clean up old news (and, weekly, old price history) once a day off-peak
     scheduler.add_job(
-        cleanup_old_price_history,
-        trigger=IntervalTrigger(days=7),
-        id="cleanup_price_history",
-        name="Clean up old price history",
+        run_daily_maintenance,
+        trigger=CronTrigger(hour=3, minute=0),
+        id="daily_maintenance",
+        name="Clean up old news and price history",
         replace_existing=True,
     )
 
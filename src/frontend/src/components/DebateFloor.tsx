@@ -121,7 +121,8 @@ const DebateFloor: React.FC<DebateFloorProps> = ({ marketId }) => {
 
             if (!response.ok) {
                 const errData = await response.json();
-                throw new Error(errData.detail || 'Failed to initiate debate');
+                const detail = errData.detail;
+                throw new Error(typeof detail === 'string' ? detail : 'Failed to initiate debate');
             }
 
             const data: DebateResponse = await response.json();